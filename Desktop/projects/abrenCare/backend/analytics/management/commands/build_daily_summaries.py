@@ -0,0 +1,61 @@
+from datetime import date as date_cls
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, router, transaction
+from django.utils import timezone
+
+from analytics.models import DailySummary
+from devices.models import Device, DeviceDataCache
+
+
+# Numeric payload keys in DeviceDataCache.data, matching what the
+# integrations emit: heart_rate -> bpm, steps -> steps, sleep -> duration_minutes
+def _json_number(key):
+    if connection.vendor == 'postgresql':
+        return f"(c.data ->> '{key}')::numeric"
+    return f"json_extract(c.data, '$.{key}')"
+
+
+class Command(BaseCommand):
+    help = "Roll DeviceDataCache rows up into DailySummary with one INSERT ... SELECT ... GROUP BY"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--date',
+            help="Day to summarize (YYYY-MM-DD). Defaults to today."
+        )
+
+    def handle(self, *args, **options):
+        try:
+            day = date_cls.fromisoformat(options['date']) if options['date'] else timezone.localdate()
+        except ValueError:
+            raise CommandError("--date must be in YYYY-MM-DD format")
+
+        if router.db_for_read(DeviceDataCache) != router.db_for_write(DailySummary):
+            raise CommandError("DeviceDataCache lives in a separate telemetry database; cannot join it to devices")
+
+        qn = connection.ops.quote_name
+        summary_table = qn(DailySummary._meta.db_table)
+        sql = f"""
+            INSERT INTO {summary_table} (user_id, {qn('date')}, avg_heart_rate, total_steps, sleep_hours)
+            SELECT
+                d.user_id,
+                c.{qn('date')},
+                ROUND(AVG(CASE WHEN c.data_type = 'heart_rate' THEN {_json_number('bpm')} END), 1),
+                COALESCE(SUM(CASE WHEN c.data_type = 'steps' THEN {_json_number('steps')} END), 0),
+                ROUND(COALESCE(SUM(CASE WHEN c.data_type = 'sleep' THEN {_json_number('duration_minutes')} END), 0) / 60.0, 1)
+            FROM {qn(DeviceDataCache._meta.db_table)} c
+            JOIN {qn(Device._meta.db_table)} d ON c.device_id = d.id
+            WHERE c.{qn('date')} = %s
+            GROUP BY d.user_id, c.{qn('date')}
+            ON CONFLICT (user_id, {qn('date')}) DO UPDATE SET
+                avg_heart_rate = excluded.avg_heart_rate,
+                total_steps = excluded.total_steps,
+                sleep_hours = excluded.sleep_hours
+        """
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(sql, [day])
+            count = cursor.rowcount
+
+        self.stdout.write(self.style.SUCCESS(f"Summarized {count} user(s) for {day}"))
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.8 on 2026-10-15 22:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='dailysummary',
+            name='avg_heart_rate',
+            field=models.DecimalField(decimal_places=1, max_digits=4, null=True),
+        ),
+        migrations.AlterField(
+            model_name='dailysummary',
+            name='sleep_hours',
+            field=models.DecimalField(decimal_places=1, default=0, max_digits=4),
+        ),
+    ]
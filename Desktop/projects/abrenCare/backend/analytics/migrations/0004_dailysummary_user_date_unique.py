@@ -0,0 +1,19 @@
+# Generated by Django 5.2.8 on 2026-10-15 22:42
+
+from django.conf import settings
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0003_compact_numeric_fields'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='dailysummary',
+            unique_together={('user', 'date')},
+        ),
+    ]
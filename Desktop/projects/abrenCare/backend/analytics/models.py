@@ -4,7 +4,9 @@ from django.db import models
 class DailySummary(models.Model):
     user = models.ForeignKey("users.User", on_delete=models.CASCADE)
     date = models.DateField()
-    avg_heart_rate = models.FloatField(null=True)
+    avg_heart_rate = models.DecimalField(max_digits=4, decimal_places=1, null=True)
     total_steps = models.IntegerField(default=0)
-    sleep_hours = models.FloatField(default=0)
+    sleep_hours = models.DecimalField(max_digits=4, decimal_places=1, default=0)
 
+    class Meta:
+        unique_together = ['user', 'date']
@@ -0,0 +1,45 @@
+# devices/fields.py
+import json
+import zlib
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+
+
+class CompressedJSONField(models.BinaryField):
+    """
+    JSON stored as a zlib-compressed BLOB.
+    
+    Only for write-heavy payloads that are never filtered on; keys inside are
+    not queryable. If that changes, move the column to a JSONField (JSONB with
+    a GIN index on PostgreSQL) instead.
+    """
+    
+    def __init__(self, *args, level=3, **kwargs):
+        self.level = level
+        super().__init__(*args, **kwargs)
+    
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        if self.level != 3:
+            kwargs['level'] = self.level
+        return name, path, args, kwargs
+    
+    def get_prep_value(self, value):
+        if value is None:
+            return None
+        payload = json.dumps(value, separators=(',', ':'), cls=DjangoJSONEncoder)
+        return zlib.compress(payload.encode(), self.level)
+    
+    def from_db_value(self, value, expression, connection):
+        if value is None:
+            return None
+        return json.loads(zlib.decompress(value))
+    
+    def to_python(self, value):
+        if isinstance(value, (bytes, memoryview)):
+            return json.loads(zlib.decompress(value))
+        return value
+    
+    def value_to_string(self, obj):
+        return json.dumps(self.value_from_object(obj), cls=DjangoJSONEncoder)
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.8 on 2026-10-15 22:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('devices', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='devicedatacache',
+            index=models.Index(fields=['device', 'data_type', '-date'], name='devcache_dev_type_date_desc'),
+        ),
+        migrations.AddIndex(
+            model_name='devicedatacache',
+            index=models.Index(fields=['expires_at', 'device'], name='devcache_exp_dev'),
+        ),
+        # Refresh planner statistics so SQLite picks the new composites.
+        migrations.RunSQL('ANALYZE;', reverse_sql=migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.8 on 2026-10-15 22:37
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('devices', '0003_devicedatacache_range_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='device',
+            options={'base_manager_name': 'objects', 'ordering': ['-last_synced', '-created_at']},
+        ),
+        migrations.AlterModelOptions(
+            name='deviceconnectionlog',
+            options={'base_manager_name': 'objects', 'ordering': ['-attempted_at']},
+        ),
+        migrations.AlterModelOptions(
+            name='devicesynclog',
+            options={'base_manager_name': 'objects', 'ordering': ['-started_at']},
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.8 on 2026-10-15 22:39
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_supported_metrics(apps, schema_editor):
+    Device = apps.get_model('devices', 'Device')
+    DeviceSupportedMetric = apps.get_model('devices', 'DeviceSupportedMetric')
+    db_alias = schema_editor.connection.alias
+    valid = {value for value, _ in DeviceSupportedMetric._meta.get_field('metric').choices}
+    rows = [
+        DeviceSupportedMetric(device_id=device_id, metric=metric)
+        for device_id, metrics in Device.objects.using(db_alias).values_list('id', 'supported_metrics').iterator()
+        for metric in set(metrics or ()) & valid
+    ]
+    DeviceSupportedMetric.objects.using(db_alias).bulk_create(rows, batch_size=500, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('devices', '0004_device_select_related_managers'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DeviceSupportedMetric',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('metric', models.CharField(choices=[('steps', 'Steps'), ('heart_rate', 'Heart Rate'), ('sleep', 'Sleep'), ('calories', 'Calories'), ('distance', 'Distance'), ('systolic', 'Systolic'), ('diastolic', 'Diastolic'), ('pulse', 'Pulse'), ('weight', 'Weight'), ('body_fat', 'Body Fat'), ('bmi', 'BMI'), ('muscle_mass', 'Muscle Mass'), ('location', 'Location'), ('screen_time', 'Screen Time')], max_length=20)),
+                ('device', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='metric_rows', to='devices.device')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['metric', 'device'], name='devices_dev_metric_89a16c_idx')],
+                'unique_together': {('device', 'metric')},
+            },
+        ),
+        migrations.RunPython(backfill_supported_metrics, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.8 on 2026-10-15 22:40
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('devices', '0005_devicesupportedmetric'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='device',
+            name='battery_level',
+            field=models.PositiveSmallIntegerField(blank=True, null=True, validators=[django.core.validators.MinValueValidator(0), django.core.validators.MaxValueValidator(100)]),
+        ),
+        migrations.AlterField(
+            model_name='device',
+            name='error_count',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AlterField(
+            model_name='device',
+            name='sync_frequency',
+            field=models.PositiveSmallIntegerField(default=15),
+        ),
+        migrations.AlterField(
+            model_name='deviceconnectionlog',
+            name='battery_level',
+            field=models.PositiveSmallIntegerField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='deviceconnectionlog',
+            name='signal_strength',
+            field=models.PositiveSmallIntegerField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.8 on 2026-10-15 22:40
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('devices', '0006_compact_numeric_fields'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='device',
+            index=models.Index(condition=models.Q(('auto_sync', True), ('is_connected', True)), fields=['is_connected', 'auto_sync', 'last_synced'], name='dev_sync_due'),
+        ),
+        migrations.AddIndex(
+            model_name='device',
+            index=models.Index(fields=['status', 'last_synced'], name='devices_dev_status_5d63a9_idx'),
+        ),
+        # Refresh planner statistics so SQLite picks the new indexes.
+        migrations.RunSQL('ANALYZE;', reverse_sql=migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.8 on 2026-10-15 22:41
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('devices', '0007_device_sync_due_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='device',
+            name='device_id',
+            field=models.CharField(blank=True, max_length=200, null=True),
+        ),
+        migrations.AddConstraint(
+            model_name='device',
+            constraint=models.UniqueConstraint(condition=models.Q(('device_id__isnull', False)), fields=('device_id',), name='uniq_device_id_notnull'),
+        ),
+        migrations.AddConstraint(
+            model_name='device',
+            constraint=models.UniqueConstraint(condition=models.Q(('bluetooth_address__isnull', False)), fields=('user', 'bluetooth_address'), name='uniq_user_bluetooth_notnull'),
+        ),
+    ]
@@ -0,0 +1,39 @@
+from django.db import migrations
+
+
+# Append-mostly time columns: BRIN is far smaller than a B-tree on PostgreSQL.
+# SQLite has no BRIN, so these are created only on PostgreSQL and are kept out
+# of model state.
+BRIN_INDEXES = (
+    ('devconnlog_attempted_brin', 'devices_deviceconnectionlog', 'attempted_at'),
+    ('devsynclog_started_brin', 'devices_devicesynclog', 'started_at'),
+    ('devcache_date_brin', 'devices_devicedatacache', 'date'),
+)
+
+
+def create_brin_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    qn = schema_editor.quote_name
+    for name, table, column in BRIN_INDEXES:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {qn(name)} ON {qn(table)} USING brin ({qn(column)})'
+        )
+
+
+def drop_brin_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, _, _ in BRIN_INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {schema_editor.quote_name(name)}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('devices', '0008_device_partial_unique_constraints'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_brin_indexes, drop_brin_indexes),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 5.2.8 on 2026-10-15 22:43
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+# DeviceDataCache.last_updated keeps auto_now for single saves; on PostgreSQL a
+# trigger also bumps it for QuerySet.update()/bulk_update(), which skip auto_now.
+TOUCH_FUNCTION_SQL = """
+CREATE OR REPLACE FUNCTION devcache_touch_last_updated() RETURNS trigger AS $$
+BEGIN
+    NEW.last_updated = now();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+TOUCH_TRIGGER_SQL = """
+CREATE TRIGGER devcache_touch_last_updated
+BEFORE UPDATE ON devices_devicedatacache
+FOR EACH ROW EXECUTE FUNCTION devcache_touch_last_updated();
+"""
+
+
+def create_touch_trigger(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(TOUCH_FUNCTION_SQL)
+    schema_editor.execute(TOUCH_TRIGGER_SQL)
+
+
+def drop_touch_trigger(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP TRIGGER IF EXISTS devcache_touch_last_updated ON devices_devicedatacache')
+    schema_editor.execute('DROP FUNCTION IF EXISTS devcache_touch_last_updated()')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('devices', '0009_postgres_brin_time_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='deviceconnectionlog',
+            name='created_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AlterField(
+            model_name='devicesynclog',
+            name='created_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.RunPython(create_touch_trigger, drop_touch_trigger),
+    ]
@@ -0,0 +1,73 @@
+import devices.fields
+from django.db import migrations
+
+
+def copy_payloads(apps, schema_editor):
+    DeviceSyncLog = apps.get_model('devices', 'DeviceSyncLog')
+    logs = DeviceSyncLog.objects.using(schema_editor.connection.alias)
+    batch = []
+    for log in logs.only('id', 'data_synced', 'metrics_count').iterator(chunk_size=1000):
+        log.data_synced_z = log.data_synced
+        log.metrics_count_z = log.metrics_count
+        batch.append(log)
+        if len(batch) >= 1000:
+            logs.bulk_update(batch, ['data_synced_z', 'metrics_count_z'])
+            batch = []
+    if batch:
+        logs.bulk_update(batch, ['data_synced_z', 'metrics_count_z'])
+
+
+def copy_payloads_back(apps, schema_editor):
+    DeviceSyncLog = apps.get_model('devices', 'DeviceSyncLog')
+    logs = DeviceSyncLog.objects.using(schema_editor.connection.alias)
+    batch = []
+    for log in logs.only('id', 'data_synced_z', 'metrics_count_z').iterator(chunk_size=1000):
+        log.data_synced = log.data_synced_z
+        log.metrics_count = log.metrics_count_z
+        batch.append(log)
+        if len(batch) >= 1000:
+            logs.bulk_update(batch, ['data_synced', 'metrics_count'])
+            batch = []
+    if batch:
+        logs.bulk_update(batch, ['data_synced', 'metrics_count'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('devices', '0010_log_created_at_defaults'),
+    ]
+
+    # JSON text can't be cast to a BLOB in place on PostgreSQL, so copy through
+    # temporary columns and swap them in.
+    operations = [
+        migrations.AddField(
+            model_name='devicesynclog',
+            name='data_synced_z',
+            field=devices.fields.CompressedJSONField(blank=True, default=dict),
+        ),
+        migrations.AddField(
+            model_name='devicesynclog',
+            name='metrics_count_z',
+            field=devices.fields.CompressedJSONField(blank=True, default=dict),
+        ),
+        migrations.RunPython(copy_payloads, copy_payloads_back),
+        migrations.RemoveField(
+            model_name='devicesynclog',
+            name='data_synced',
+        ),
+        migrations.RemoveField(
+            model_name='devicesynclog',
+            name='metrics_count',
+        ),
+        migrations.RenameField(
+            model_name='devicesynclog',
+            old_name='data_synced_z',
+            new_name='data_synced',
+        ),
+        migrations.RenameField(
+            model_name='devicesynclog',
+            old_name='metrics_count_z',
+            new_name='metrics_count',
+        ),
+    ]
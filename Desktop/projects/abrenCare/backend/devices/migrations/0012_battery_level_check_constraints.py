@@ -0,0 +1,28 @@
+# Generated by Django 5.2.8 on 2026-10-15 22:45
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('devices', '0011_compress_sync_log_payloads'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='device',
+            name='battery_level',
+            field=models.PositiveSmallIntegerField(blank=True, null=True),
+        ),
+        migrations.AddConstraint(
+            model_name='device',
+            constraint=models.CheckConstraint(condition=models.Q(models.Q(('battery_level__gte', 0), ('battery_level__lte', 100)), ('battery_level__isnull', True), _connector='OR'), name='battery_0_100'),
+        ),
+        migrations.AddConstraint(
+            model_name='deviceconnectionlog',
+            constraint=models.CheckConstraint(condition=models.Q(models.Q(('battery_level__gte', 0), ('battery_level__lte', 100)), ('battery_level__isnull', True), _connector='OR'), name='connlog_battery_0_100'),
+        ),
+    ]
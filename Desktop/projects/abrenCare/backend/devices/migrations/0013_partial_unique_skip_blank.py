@@ -0,0 +1,31 @@
+# Generated by Django 5.2.8 on 2026-10-15 23:59
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('devices', '0012_battery_level_check_constraints'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='device',
+            name='uniq_device_id_notnull',
+        ),
+        migrations.RemoveConstraint(
+            model_name='device',
+            name='uniq_user_bluetooth_notnull',
+        ),
+        migrations.AddConstraint(
+            model_name='device',
+            constraint=models.UniqueConstraint(condition=models.Q(('device_id__isnull', False), models.Q(('device_id', ''), _negated=True)), fields=('device_id',), name='uniq_device_id_notnull'),
+        ),
+        migrations.AddConstraint(
+            model_name='device',
+            constraint=models.UniqueConstraint(condition=models.Q(('bluetooth_address__isnull', False), models.Q(('bluetooth_address', ''), _negated=True)), fields=('user', 'bluetooth_address'), name='uniq_user_bluetooth_notnull'),
+        ),
+    ]
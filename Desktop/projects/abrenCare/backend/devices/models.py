@@ -1,10 +1,13 @@
 # devices/models.py
-from django.db import models
+from django.db import models, transaction, connections, router
 from users.models import User
-from django.core.validators import MinValueValidator, MaxValueValidator
 from django.utils import timezone
+from django.utils.functional import cached_property
+from datetime import timedelta
 import json
 
+from .fields import CompressedJSONField
+
 
 class DeviceType(models.TextChoices):
     SMARTWATCH = 'smartwatch', 'Smart Watch'
@@ -36,6 +39,23 @@ class ConnectionType(models.TextChoices):
     CLOUD = 'cloud', 'Cloud API'
 
 
+class SupportedMetric(models.TextChoices):
+    STEPS = 'steps', 'Steps'
+    HEART_RATE = 'heart_rate', 'Heart Rate'
+    SLEEP = 'sleep', 'Sleep'
+    CALORIES = 'calories', 'Calories'
+    DISTANCE = 'distance', 'Distance'
+    SYSTOLIC = 'systolic', 'Systolic'
+    DIASTOLIC = 'diastolic', 'Diastolic'
+    PULSE = 'pulse', 'Pulse'
+    WEIGHT = 'weight', 'Weight'
+    BODY_FAT = 'body_fat', 'Body Fat'
+    BMI = 'bmi', 'BMI'
+    MUSCLE_MASS = 'muscle_mass', 'Muscle Mass'
+    LOCATION = 'location', 'Location'
+    SCREEN_TIME = 'screen_time', 'Screen Time'
+
+
 class DeviceStatus(models.TextChoices):
     DISCONNECTED = 'disconnected', 'Disconnected'
     CONNECTED = 'connected', 'Connected'
@@ -45,6 +65,100 @@ class DeviceStatus(models.TextChoices):
     LOW_BATTERY = 'low_battery', 'Low Battery'
 
 
+# Plain values for per-device checks in the sync loop
+_ERROR = DeviceStatus.ERROR.value
+_CLOUD = ConnectionType.CLOUD.value
+
+
+class DeviceQuerySet(models.QuerySet):
+    def sync_scan(self, chunk_size=1000):
+        """Stream auto-sync devices with only the columns the scheduler reads"""
+        return self.select_related(None).filter(auto_sync=True).only(
+            'id', 'user_id', 'status', 'last_synced', 'sync_frequency', 'connection_type',
+        ).iterator(chunk_size=chunk_size)
+    
+    def supporting(self, metric):
+        """Devices that track a metric, via the indexed DeviceSupportedMetric table"""
+        return self.filter(metric_rows__metric=metric)
+
+
+class DeviceManager(models.Manager.from_queryset(DeviceQuerySet)):
+    """Joins the owner so Device.__str__ doesn't query per row"""
+    
+    def get_queryset(self):
+        return super().get_queryset().select_related('user')
+    
+    def bulk_set_status(self, device_ids, status):
+        """Set one status on many devices with a single UPDATE"""
+        now = timezone.now()
+        fields = {'status': status, 'updated_at': now}
+        if status == DeviceStatus.CONNECTED:
+            fields.update(is_connected=True, last_connected=now)
+        elif status == DeviceStatus.DISCONNECTED:
+            fields['is_connected'] = False
+        return self.filter(pk__in=device_ids).update(**fields)
+    
+    def bulk_update_status(self, devices, batch_size=500):
+        """Persist per-device status changes made with update_status(save=False)"""
+        now = timezone.now()
+        for device in devices:
+            device.updated_at = now
+        return self.bulk_update(
+            devices,
+            ['status', 'is_connected', 'last_connected', 'updated_at'],
+            batch_size=batch_size,
+        )
+
+
+class DeviceLogManager(models.Manager):
+    """Joins device and owner for log listings"""
+    
+    def get_queryset(self):
+        qs = super().get_queryset()
+        # No join when the logs live in a separate telemetry database
+        if router.db_for_read(self.model) != router.db_for_read(Device):
+            return qs
+        return qs.select_related('device', 'device__user')
+    
+    def bulk_log(self, entries, batch_size=500):
+        """Insert many log rows in one transaction with multi-row INSERTs"""
+        objs = [self.model(**entry) for entry in entries]
+        with transaction.atomic(using=self.db):
+            return self.bulk_create(objs, batch_size=batch_size, ignore_conflicts=True)
+    
+    def prune(self, cutoff, field='created_at', batch_size=1000):
+        """Delete rows older than cutoff in id batches without loading instances"""
+        stale = self.get_queryset().filter(**{f'{field}__lt': cutoff})
+        deleted = 0
+        while True:
+            ids = list(stale.values_list('id', flat=True)[:batch_size])
+            if not ids:
+                return deleted
+            deleted += self.filter(pk__in=ids).delete()[0]
+    
+    def bulk_log_raw(self, entries):
+        """
+        Hot ingest path: a single executemany without building model instances.
+        Entries are keyed by column attname (e.g. `device_id`, not `device`).
+        """
+        meta = self.model._meta
+        connection = connections[self.db]
+        fields = [f for f in meta.concrete_fields if not f.primary_key]
+        defaults = {f.attname: f.get_default() for f in fields}
+        rows = [
+            [f.get_db_prep_save(entry.get(f.attname, defaults[f.attname]), connection) for f in fields]
+            for entry in entries
+        ]
+        sql = 'INSERT INTO {} ({}) VALUES ({})'.format(
+            connection.ops.quote_name(meta.db_table),
+            ', '.join(connection.ops.quote_name(f.column) for f in fields),
+            ', '.join(['%s'] * len(fields)),
+        )
+        with transaction.atomic(using=self.db), connection.cursor() as cursor:
+            cursor.executemany(sql, rows)
+        return len(rows)
+
+
 class Device(models.Model):
     """Main device model"""
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='devices')
@@ -59,7 +173,7 @@ class Device(models.Model):
     bluetooth_address = models.CharField(max_length=17, blank=True, null=True)  # Format: XX:XX:XX:XX:XX:XX
     bluetooth_name = models.CharField(max_length=100, blank=True, null=True)
     wifi_mac_address = models.CharField(max_length=17, blank=True, null=True)
-    device_id = models.CharField(max_length=200, unique=True, blank=True, null=True)  # Unique device identifier
+    device_id = models.CharField(max_length=200, blank=True, null=True)  # Unique device identifier
     
     # API credentials for cloud-based devices
     api_key = models.CharField(max_length=500, blank=True, null=True)
@@ -69,11 +183,7 @@ class Device(models.Model):
     token_expires_at = models.DateTimeField(blank=True, null=True)
     
     # Device status
-    battery_level = models.IntegerField(
-        validators=[MinValueValidator(0), MaxValueValidator(100)],
-        blank=True,
-        null=True
-    )
+    battery_level = models.PositiveSmallIntegerField(blank=True, null=True)  # 0-100, see battery_0_100
     last_synced = models.DateTimeField(blank=True, null=True)
     last_connected = models.DateTimeField(blank=True, null=True)
     is_connected = models.BooleanField(default=False)
@@ -90,28 +200,57 @@ class Device(models.Model):
     
     # Settings
     auto_sync = models.BooleanField(default=True)
-    sync_frequency = models.IntegerField(default=15)  # minutes
+    sync_frequency = models.PositiveSmallIntegerField(default=15)  # minutes
     sync_on_startup = models.BooleanField(default=True)
     
     # Metadata
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     last_error = models.TextField(blank=True, null=True)
-    error_count = models.IntegerField(default=0)
+    error_count = models.PositiveSmallIntegerField(default=0)
+    
+    objects = DeviceManager()
     
     class Meta:
+        base_manager_name = 'objects'
         ordering = ['-last_synced', '-created_at']
         indexes = [
             models.Index(fields=['user', 'is_connected']),
             models.Index(fields=['bluetooth_address']),
             models.Index(fields=['device_id']),
+            # Background sync scan: connected, auto-sync devices ordered by staleness
+            models.Index(
+                fields=['is_connected', 'auto_sync', 'last_synced'],
+                name='dev_sync_due',
+                condition=models.Q(is_connected=True, auto_sync=True),
+            ),
+            models.Index(fields=['status', 'last_synced']),
+        ]
+        # Partial unique indexes skip the NULL/blank rows most devices have
+        constraints = [
+            models.UniqueConstraint(
+                fields=['device_id'],
+                name='uniq_device_id_notnull',
+                condition=models.Q(device_id__isnull=False) & ~models.Q(device_id=''),
+            ),
+            models.UniqueConstraint(
+                fields=['user', 'bluetooth_address'],
+                name='uniq_user_bluetooth_notnull',
+                condition=models.Q(bluetooth_address__isnull=False) & ~models.Q(bluetooth_address=''),
+            ),
+            # Enforced by the database so bulk paths can't bypass it
+            models.CheckConstraint(
+                condition=models.Q(battery_level__gte=0, battery_level__lte=100) | models.Q(battery_level__isnull=True),
+                name='battery_0_100',
+            ),
         ]
     
     def __str__(self):
         return f"{self.device_name} ({self.manufacturer}) - {self.user.username}"
     
-    def get_connection_info(self):
-        """Get connection information based on connection type"""
+    @cached_property
+    def connection_info(self):
+        """Connection information based on connection type, built once per instance"""
         if self.connection_type == ConnectionType.BLUETOOTH:
             return {
                 'type': 'bluetooth',
@@ -126,10 +265,18 @@ class Device(models.Model):
         elif self.connection_type == ConnectionType.CLOUD:
             return {
                 'type': 'cloud',
-                'has_token': bool(self.access_token)
+                'has_token': self.has_access_token()
             }
         return {'type': self.connection_type}
     
+    def get_connection_info(self):
+        """Get connection information based on connection type"""
+        return self.connection_info
+    
+    def has_access_token(self):
+        """Whether an access token is stored"""
+        return bool(self.access_token)
+    
     def update_status(self, status, save=True):
         """Update device status"""
         self.status = status
@@ -143,10 +290,63 @@ class Device(models.Model):
     
     def can_sync(self):
         """Check if device can sync"""
-        return (
-            self.is_connected or 
-            self.connection_type == ConnectionType.CLOUD
-        ) and self.status != DeviceStatus.ERROR
+        # Error rows are rare, so reject them first and skip the OR
+        return self.status != _ERROR and (self.is_connected or self.connection_type == _CLOUD)
+    
+    def sync_supported_metrics(self):
+        """Mirror the supported_metrics JSON list into DeviceSupportedMetric rows"""
+        metrics = set(self.supported_metrics or ()) & set(SupportedMetric.values)
+        self.metric_rows.exclude(metric__in=metrics).delete()
+        DeviceSupportedMetric.objects.bulk_create(
+            [DeviceSupportedMetric(device=self, metric=metric) for metric in metrics],
+            ignore_conflicts=True,
+        )
+    
+    @classmethod
+    def with_recent_logs(cls, user, limit=20):
+        """
+        A user's devices with their latest sync/connection logs and cache rows
+        attached as `recent_logs`, `recent_connection_logs` and `recent_cache`.
+        
+        Children are prefetched rather than joined so the wide Device row isn't
+        repeated once per log. For small fan-outs a plain select_related may
+        still win, so benchmark through this helper before changing it.
+        """
+        return cls.objects.filter(user=user).prefetch_related(
+            models.Prefetch(
+                'sync_logs',
+                queryset=DeviceSyncLog.objects.select_related(None).order_by('-started_at')[:limit],
+                to_attr='recent_logs',
+            ),
+            models.Prefetch(
+                'connection_logs',
+                queryset=DeviceConnectionLog.objects.select_related(None).order_by('-attempted_at')[:limit],
+                to_attr='recent_connection_logs',
+            ),
+            models.Prefetch(
+                'data_cache',
+                queryset=DeviceDataCache.objects.order_by('-date')[:limit],
+                to_attr='recent_cache',
+            ),
+        )
+
+
+class DeviceSupportedMetric(models.Model):
+    """
+    Normalized copy of Device.supported_metrics so "which devices support X"
+    is an index seek instead of parsing JSON per row.
+    """
+    device = models.ForeignKey(Device, on_delete=models.CASCADE, related_name='metric_rows')
+    metric = models.CharField(max_length=20, choices=SupportedMetric.choices)
+    
+    class Meta:
+        unique_together = ['device', 'metric']
+        indexes = [
+            models.Index(fields=['metric', 'device']),
+        ]
+    
+    def __str__(self):
+        return f"{self.device_id} - {self.metric}"
 
 
 class DeviceSyncLog(models.Model):
@@ -167,12 +367,15 @@ class DeviceSyncLog(models.Model):
         ('failed', 'Failed'),
         ('cancelled', 'Cancelled')
     ])
-    data_synced = models.JSONField(default=dict, blank=True)  # What data was synced
-    metrics_count = models.JSONField(default=dict, blank=True)  # Count of each metric type
+    data_synced = CompressedJSONField(default=dict, blank=True)  # What data was synced
+    metrics_count = CompressedJSONField(default=dict, blank=True)  # Count of each metric type
     error_message = models.TextField(blank=True, null=True)
-    created_at = models.DateTimeField(auto_now_add=True)
+    created_at = models.DateTimeField(default=timezone.now)
+    
+    objects = DeviceLogManager()
     
     class Meta:
+        base_manager_name = 'objects'
         ordering = ['-started_at']
     
     def __str__(self):
@@ -188,12 +391,21 @@ class DeviceConnectionLog(models.Model):
     disconnected_at = models.DateTimeField(null=True, blank=True)
     status = models.CharField(max_length=20)
     error_message = models.TextField(blank=True, null=True)
-    signal_strength = models.IntegerField(null=True, blank=True)  # For Bluetooth/WiFi
-    battery_level = models.IntegerField(null=True, blank=True)
-    created_at = models.DateTimeField(auto_now_add=True)
+    signal_strength = models.PositiveSmallIntegerField(null=True, blank=True)  # For Bluetooth/WiFi
+    battery_level = models.PositiveSmallIntegerField(null=True, blank=True)
+    created_at = models.DateTimeField(default=timezone.now)
+    
+    objects = DeviceLogManager()
     
     class Meta:
+        base_manager_name = 'objects'
         ordering = ['-attempted_at']
+        constraints = [
+            models.CheckConstraint(
+                condition=models.Q(battery_level__gte=0, battery_level__lte=100) | models.Q(battery_level__isnull=True),
+                name='connlog_battery_0_100',
+            ),
+        ]
 
 
 class DeviceDataCache(models.Model):
@@ -210,10 +422,32 @@ class DeviceDataCache(models.Model):
         indexes = [
             models.Index(fields=['device', 'data_type', 'date']),
             models.Index(fields=['expires_at']),
+            models.Index(fields=['device', 'data_type', '-date'], name='devcache_dev_type_date_desc'),
+            models.Index(fields=['expires_at', 'device'], name='devcache_exp_dev'),
         ]
     
     def is_expired(self):
         return timezone.now() > self.expires_at
+    
+    # Filter on the raw indexed columns with half-open ranges. Never write
+    # `.filter(expires_at__date=...)`, `date__year`/`date__month` lookups or
+    # `.annotate(Extract('date'))` in WHERE clauses: wrapping the column in a
+    # function stops SQLite from using the index, and the range is equivalent.
+    @classmethod
+    def expired_qs(cls):
+        """Cache rows whose expiry has passed"""
+        return cls.objects.filter(expires_at__lt=timezone.now())
+    
+    @classmethod
+    def fresh_for(cls, device, data_type, day):
+        """Unexpired cache rows for a device/data type on a given day"""
+        return cls.objects.filter(
+            device=device,
+            data_type=data_type,
+            date__gte=day,
+            date__lt=day + timedelta(days=1),
+            expires_at__gte=timezone.now(),
+        )
 
 
 class DeviceDriver(models.Model):
@@ -24,11 +24,5 @@ class IsDeviceOwner(permissions.BasePermission):
         """
         Check if the user has permission to access a specific device object.
         """
-        # Allow read-only access for safe methods
-        if request.method in permissions.SAFE_METHODS:
-            # Check if the device belongs to the user
-            return obj.user == request.user
-        
-        # For write methods, check ownership
-        return obj.user == request.user
-    
\ No newline at end of file
+        # Compare ids so the owner row is never fetched
+        return obj.user_id == request.user.id
@@ -0,0 +1,24 @@
+# devices/renderers.py
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - falls back to DRF's stdlib renderer
+    orjson = None
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer that encodes with orjson when it is installed. Types orjson
+    doesn't know (Decimal, lazy strings, querysets...) go through DRF's
+    encoder, so output matches the stock renderer.
+    """
+    _default = staticmethod(JSONEncoder().default)
+    
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None:
+            return super().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b''
+        return orjson.dumps(data, default=self._default, option=orjson.OPT_NON_STR_KEYS)
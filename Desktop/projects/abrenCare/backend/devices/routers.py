@@ -0,0 +1,55 @@
+# devices/routers.py
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+
+TELEMETRY_DB = 'telemetry'
+
+# Append-mostly telemetry tables (lowercase model names)
+TELEMETRY_MODELS = frozenset({'devicesynclog', 'deviceconnectionlog', 'devicedatacache'})
+
+
+def _is_telemetry(model):
+    return model._meta.app_label == 'devices' and model._meta.model_name in TELEMETRY_MODELS
+
+
+class TelemetryRouter:
+    """
+    Send device logs and the data cache to the `telemetry` database so their
+    bulk inserts don't compete with user/device commits.
+    
+    Only active when DATABASES has a `telemetry` alias. Django can't follow
+    relations across databases, so in that setup:
+    - log/cache querysets don't join Device (see DeviceLogManager)
+    - deleting a Device doesn't cascade into telemetry rows; they age out
+      through DeviceLogManager.prune()
+    - build_daily_summaries refuses to run, since it joins the cache to Device
+    """
+    
+    def _enabled(self):
+        return TELEMETRY_DB in settings.DATABASES
+    
+    def db_for_read(self, model, **hints):
+        if not self._enabled():
+            return None
+        if _is_telemetry(model):
+            return TELEMETRY_DB
+        # log.device would otherwise follow the log's own alias
+        instance = hints.get('instance')
+        if instance is not None and _is_telemetry(instance.__class__):
+            return DEFAULT_DB_ALIAS
+        return None
+    
+    def db_for_write(self, model, **hints):
+        return self.db_for_read(model, **hints)
+    
+    def allow_relation(self, obj1, obj2, **hints):
+        if self._enabled() and (_is_telemetry(obj1.__class__) or _is_telemetry(obj2.__class__)):
+            return True
+        return None
+    
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db == TELEMETRY_DB:
+            return app_label == 'devices' and model_name in TELEMETRY_MODELS
+        # Empty copies stay on default so Device cascades still find the tables
+        return None
@@ -1,15 +1,179 @@
 # devices/serializers.py
+import copy
+from bisect import bisect_right
+from datetime import timedelta
+from types import MappingProxyType
 from rest_framework import serializers
+from django.db.models import Prefetch
 from django.utils import timezone
 from .models import (
     Device, DeviceSyncLog, DeviceConnectionLog, 
     DeviceDataCache, DeviceDriver,
     DeviceType, DeviceManufacturer, ConnectionType, DeviceStatus
 )
+from users.models import User
 from users.serializers import UserSerializer
 
 
-class DeviceSerializer(serializers.ModelSerializer):
+def _context_now(serializer):
+    """
+    One timezone.now() per serialization pass. Nested and many=True children
+    share the root's context, so every row sees the same timestamp.
+    """
+    context = serializer.context
+    now = context.get('_now')
+    if now is None:
+        now = context['_now'] = timezone.now()
+    return now
+
+
+# Devices seen within this window still count as online
+_ONLINE_WINDOW = timedelta(minutes=5)
+
+
+def _context_online_cutoff(serializer):
+    """now - _ONLINE_WINDOW, computed once per pass like _context_now"""
+    context = serializer.context
+    cutoff = context.get('_online_cutoff')
+    if cutoff is None:
+        cutoff = context['_online_cutoff'] = _context_now(serializer) - _ONLINE_WINDOW
+    return cutoff
+
+
+# (min seconds, divisor, template) rows, largest unit first. Templates get
+# {0} = seconds / divisor and {1} = seconds // divisor.
+_CONNECTION_DURATION_UNITS = (
+    (3600, 3600, '{0:.1f}h'),
+    (60, 60, '{0:.0f}m'),
+    (0, 1, '{0:.0f}s'),
+)
+
+
+# value -> label, same fallback as get_FOO_display() for unknown values
+_DEVICE_TYPE_LABELS = dict(DeviceType.choices)
+_MANUFACTURER_LABELS = dict(DeviceManufacturer.choices)
+_CONNECTION_TYPE_LABELS = dict(ConnectionType.choices)
+_STATUS_LABELS = dict(DeviceStatus.choices)
+
+# device_id lookups for the log/cache serializers: just the columns their
+# StringRelatedField needs to render str(device)
+_DEVICE_PK_QUERYSET = Device.objects.only('id', 'device_name', 'manufacturer', 'user__username')
+
+_BASE_CAPABILITIES = MappingProxyType({
+    'can_sync': True,
+    'can_notify': True,
+    'supports_realtime': False,
+})
+
+# Built once at import; each entry already includes the base capabilities
+_DEFAULT_CAPABILITIES = {
+    device_type: MappingProxyType({**_BASE_CAPABILITIES, **extras})
+    for device_type, extras in {
+        DeviceType.SMARTWATCH: {
+            'can_track_steps': True,
+            'can_track_heart_rate': True,
+            'can_track_sleep': True,
+            'supports_notifications': True,
+            'supports_watch_faces': True,
+        },
+        DeviceType.FITNESS_BAND: {
+            'can_track_steps': True,
+            'can_track_heart_rate': True,
+            'can_track_sleep': True,
+            'supports_notifications': True,
+        },
+        DeviceType.HEART_RATE_MONITOR: {
+            'can_track_heart_rate': True,
+            'supports_realtime': True,
+        },
+        DeviceType.BLOOD_PRESSURE: {
+            'can_track_blood_pressure': True,
+        },
+        DeviceType.SMART_SCALE: {
+            'can_track_weight': True,
+            'can_track_body_fat': True,
+            'can_track_bmi': True,
+        },
+    }.items()
+}
+
+_DEFAULT_METRICS = {
+    DeviceType.SMARTWATCH: ('steps', 'heart_rate', 'sleep', 'calories', 'distance'),
+    DeviceType.FITNESS_BAND: ('steps', 'heart_rate', 'sleep', 'calories'),
+    DeviceType.HEART_RATE_MONITOR: ('heart_rate',),
+    DeviceType.BLOOD_PRESSURE: ('systolic', 'diastolic', 'pulse'),
+    DeviceType.SMART_SCALE: ('weight', 'body_fat', 'bmi', 'muscle_mass'),
+    DeviceType.PHONE: ('steps', 'location', 'screen_time'),
+}
+
+
+def _connection_required(target):
+    """connection type -> {required field: error message} for `target`"""
+    return {
+        ConnectionType.BLUETOOTH: {
+            'bluetooth_address': f'Bluetooth address is required for Bluetooth {target}',
+        },
+        ConnectionType.WIFI: {
+            'wifi_mac_address': f'Wi-Fi MAC address is required for Wi-Fi {target}',
+        },
+        ConnectionType.CLOUD: {
+            'api_key': f'API key is required for cloud {target}',
+            'api_secret': f'API secret is required for cloud {target}',
+        },
+    }
+
+
+_DEVICE_CONNECTION_REQUIRED = _connection_required('devices')
+# Covered by partial unique constraints on Device
+_UNIQUE_IDENTIFIER_FIELDS = ('bluetooth_address', 'device_id')
+# Connection requests don't carry a Wi-Fi MAC
+_REQUEST_CONNECTION_REQUIRED = {
+    connection_type: messages
+    for connection_type, messages in _connection_required('connection').items()
+    if connection_type != ConnectionType.WIFI
+}
+
+
+def _validate_connection_fields(data, required):
+    """Raise one error listing the group's fields if any of them is missing"""
+    messages = required.get(data.get('connection_type'))
+    if messages and not all(data.get(field) for field in messages):
+        raise serializers.ValidationError(dict(messages))
+
+
+# Lower bounds of each signal band after the first; bisect_right picks the label
+_SIGNAL_THRESHOLDS = (20, 40, 60, 80)
+_SIGNAL_LABELS = ("Very Poor", "Poor", "Fair", "Good", "Excellent")
+
+
+def _humanize(seconds, units, fallback=None):
+    """Format seconds with the first unit row whose threshold it reaches"""
+    for threshold, divisor, template in units:
+        if seconds >= threshold:
+            return template.format(seconds / divisor, seconds // divisor)
+    return fallback
+
+
+class CachedFieldsMixin:
+    """
+    Build a ModelSerializer's field graph once per class and hand each
+    instance a deep copy, skipping the model introspection DRF repeats on
+    every instantiation. Fields are bound per instance, so they can't be
+    shared outright. Only for serializers whose fields don't depend on
+    context or instance.
+    """
+    
+    def get_fields(self):
+        cls = type(self)
+        # Look in the class's own __dict__ so subclasses build their own
+        prototype = cls.__dict__.get('_fields_prototype')
+        if prototype is None:
+            prototype = super().get_fields()
+            cls._fields_prototype = prototype
+        return copy.deepcopy(prototype)
+
+
+class DeviceSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """Main device serializer"""
     user = UserSerializer(read_only=True)
     user_id = serializers.PrimaryKeyRelatedField(
@@ -18,15 +182,6 @@ class DeviceSerializer(serializers.ModelSerializer):
         write_only=True
     )
     
-    # Readable choices fields
-    device_type_display = serializers.CharField(source='get_device_type_display', read_only=True)
-    manufacturer_display = serializers.CharField(source='get_manufacturer_display', read_only=True)
-    connection_type_display = serializers.CharField(source='get_connection_type_display', read_only=True)
-    status_display = serializers.CharField(source='get_status_display', read_only=True)
-    
-    # Connection info computed field
-    connection_info = serializers.SerializerMethodField()
-    
     # Security fields (write-only for sensitive data)
     api_key = serializers.CharField(write_only=True, required=False, allow_blank=True)
     api_secret = serializers.CharField(write_only=True, required=False, allow_blank=True)
@@ -35,21 +190,18 @@ class DeviceSerializer(serializers.ModelSerializer):
     
     # Computed fields
     can_sync = serializers.BooleanField(read_only=True)
-    is_online = serializers.SerializerMethodField()
-    last_synced_display = serializers.SerializerMethodField()
-    last_connected_display = serializers.SerializerMethodField()
     
     class Meta:
         model = Device
         fields = [
             'id',
             'user', 'user_id',
-            'device_name', 'device_type', 'device_type_display',
-            'manufacturer', 'manufacturer_display',
+            'device_name', 'device_type',
+            'manufacturer',
             'model', 'serial_number',
             
             # Connection fields
-            'connection_type', 'connection_type_display',
+            'connection_type',
             'bluetooth_address', 'bluetooth_name',
             'wifi_mac_address', 'device_id',
             
@@ -58,10 +210,8 @@ class DeviceSerializer(serializers.ModelSerializer):
             'token_expires_at',
             
             # Status fields
-            'battery_level', 'last_synced', 'last_synced_display',
-            'last_connected', 'last_connected_display',
-            'is_connected', 'is_online',
-            'status', 'status_display',
+            'battery_level', 'last_synced', 'last_connected',
+            'is_connected', 'status',
             
             # Capabilities
             'capabilities', 'supported_metrics',
@@ -73,7 +223,7 @@ class DeviceSerializer(serializers.ModelSerializer):
             'auto_sync', 'sync_frequency', 'sync_on_startup',
             
             # Computed fields
-            'connection_info', 'can_sync',
+            'can_sync',
             
             # Metadata
             'created_at', 'updated_at',
@@ -83,9 +233,37 @@ class DeviceSerializer(serializers.ModelSerializer):
             'created_at', 'updated_at', 'last_error', 'error_count',
             'last_synced', 'last_connected', 'is_connected', 'status'
         ]
-    
-    def get_connection_info(self, obj):
-        return obj.get_connection_info()
+        # DRF's UniqueTogetherValidator ignores the constraint's condition and
+        # would demand a bluetooth_address from every device; validate() checks it
+        validators = []
+        # Forward relations rendered by nested serializers; joined in setup_eager_loading
+        nested_serializers = {'user': UserSerializer}
+        # Add the choice labels, is_online and connection_info in
+        # to_representation (plain calls instead of a field dispatch per value)
+        include_computed_fields = True
+    
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        """
+        Join/prefetch everything this serializer renders so list views run a
+        fixed number of queries. Views should pass their queryset through
+        this, e.g. DeviceSerializer.setup_eager_loading(Device.objects.all()).
+        """
+        related = [name for name in cls.Meta.nested_serializers if name in cls.Meta.fields]
+        if related:
+            queryset = queryset.select_related(*related)
+        return queryset
+    
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        if self.Meta.include_computed_fields:
+            data['device_type_display'] = _DEVICE_TYPE_LABELS.get(instance.device_type, instance.device_type)
+            data['manufacturer_display'] = _MANUFACTURER_LABELS.get(instance.manufacturer, instance.manufacturer)
+            data['connection_type_display'] = _CONNECTION_TYPE_LABELS.get(instance.connection_type, instance.connection_type)
+            data['status_display'] = _STATUS_LABELS.get(instance.status, instance.status)
+            data['is_online'] = self.get_is_online(instance)
+            data['connection_info'] = instance.connection_info
+        return data
     
     def get_is_online(self, obj):
         """Check if device is online (connected or recently connected)"""
@@ -95,63 +273,50 @@ class DeviceSerializer(serializers.ModelSerializer):
         # For cloud devices, check token expiry
         if obj.connection_type == ConnectionType.CLOUD:
             if obj.token_expires_at:
-                return obj.token_expires_at > timezone.now()
-            return bool(obj.access_token)
+                return obj.token_expires_at > _context_now(self)
+            return obj.has_access_token()
         
         # For disconnected devices, check if they were recently connected
         if obj.last_connected:
-            time_since_last = timezone.now() - obj.last_connected
-            return time_since_last.total_seconds() < 300  # 5 minutes
+            return obj.last_connected > _context_online_cutoff(self)
         
         return False
     
-    def get_last_synced_display(self, obj):
-        if not obj.last_synced:
-            return "Never"
-        time_diff = timezone.now() - obj.last_synced
-        if time_diff.days > 0:
-            return f"{time_diff.days}d ago"
-        elif time_diff.seconds > 3600:
-            return f"{time_diff.seconds // 3600}h ago"
-        elif time_diff.seconds > 60:
-            return f"{time_diff.seconds // 60}m ago"
-        return "Just now"
-    
-    def get_last_connected_display(self, obj):
-        if not obj.last_connected:
-            return "Never"
-        time_diff = timezone.now() - obj.last_connected
-        if time_diff.days > 0:
-            return f"{time_diff.days}d ago"
-        elif time_diff.seconds > 3600:
-            return f"{time_diff.seconds // 3600}h ago"
-        elif time_diff.seconds > 60:
-            return f"{time_diff.seconds // 60}m ago"
-        return "Just now"
-    
     def validate(self, data):
         """Validate device data"""
-        # Validate connection type specific fields
-        connection_type = data.get('connection_type')
+        # Validate connection type specific fields; existing cloud devices
+        # may already hold tokens, so only new ones need API credentials
+        if self.instance is None or data.get('connection_type') != ConnectionType.CLOUD:
+            _validate_connection_fields(data, _DEVICE_CONNECTION_REQUIRED)
         
-        if connection_type == ConnectionType.BLUETOOTH:
-            if not data.get('bluetooth_address'):
-                raise serializers.ValidationError({
-                    'bluetooth_address': 'Bluetooth address is required for Bluetooth devices'
-                })
-        elif connection_type == ConnectionType.WIFI:
-            if not data.get('wifi_mac_address'):
+        # Store blank identifiers as NULL, which the partial unique constraints skip
+        for field in _UNIQUE_IDENTIFIER_FIELDS:
+            if data.get(field) == '':
+                data[field] = None
+        
+        # One device per Bluetooth address per user (uniq_user_bluetooth_notnull)
+        bluetooth_address = data.get('bluetooth_address')
+        if bluetooth_address:
+            user = data.get('user')
+            request = self.context.get('request')
+            if user is not None:
+                user_id = user.pk
+            elif self.instance is not None:
+                user_id = self.instance.user_id
+            elif request is not None:
+                # New devices are saved for the requesting user
+                user_id = request.user.pk
+            else:
+                raise serializers.ValidationError({'user': 'Device owner is required'})
+            duplicates = Device.objects.select_related(None).filter(
+                user_id=user_id, bluetooth_address=bluetooth_address
+            )
+            if self.instance is not None:
+                duplicates = duplicates.exclude(pk=self.instance.pk)
+            if duplicates.exists():
                 raise serializers.ValidationError({
-                    'wifi_mac_address': 'Wi-Fi MAC address is required for Wi-Fi devices'
+                    'bluetooth_address': 'A device with this Bluetooth address is already registered'
                 })
-        elif connection_type == ConnectionType.CLOUD:
-            if not data.get('api_key') or not data.get('api_secret'):
-                # Only validate for new devices, existing ones might have tokens
-                if self.instance is None:
-                    raise serializers.ValidationError({
-                        'api_key': 'API key is required for cloud devices',
-                        'api_secret': 'API secret is required for cloud devices'
-                    })
         
         # Validate battery level
         battery_level = data.get('battery_level')
@@ -183,67 +348,34 @@ class DeviceSerializer(serializers.ModelSerializer):
         if 'supported_metrics' not in validated_data:
             validated_data['supported_metrics'] = self.get_default_metrics(device_type)
         
-        return super().create(validated_data)
+        device = super().create(validated_data)
+        device.sync_supported_metrics()
+        return device
+    
+    def update(self, instance, validated_data):
+        device = super().update(instance, validated_data)
+        if 'supported_metrics' in validated_data:
+            device.sync_supported_metrics()
+        return device
     
     def get_default_capabilities(self, device_type, manufacturer):
         """Get default capabilities for device type"""
-        capabilities = {
-            'can_sync': True,
-            'can_notify': True,
-            'supports_realtime': False,
-        }
-        
-        if device_type == DeviceType.SMARTWATCH:
-            capabilities.update({
-                'can_track_steps': True,
-                'can_track_heart_rate': True,
-                'can_track_sleep': True,
-                'supports_notifications': True,
-                'supports_watch_faces': True,
-            })
-        elif device_type == DeviceType.FITNESS_BAND:
-            capabilities.update({
-                'can_track_steps': True,
-                'can_track_heart_rate': True,
-                'can_track_sleep': True,
-                'supports_notifications': True,
-            })
-        elif device_type == DeviceType.HEART_RATE_MONITOR:
-            capabilities.update({
-                'can_track_heart_rate': True,
-                'supports_realtime': True,
-            })
-        elif device_type == DeviceType.BLOOD_PRESSURE:
-            capabilities.update({
-                'can_track_blood_pressure': True,
-            })
-        elif device_type == DeviceType.SMART_SCALE:
-            capabilities.update({
-                'can_track_weight': True,
-                'can_track_body_fat': True,
-                'can_track_bmi': True,
-            })
-        
-        return capabilities
+        # Fresh dict: the result is stored and may be edited per device
+        return dict(_DEFAULT_CAPABILITIES.get(device_type, _BASE_CAPABILITIES))
     
     def get_default_metrics(self, device_type):
         """Get default metrics for device type"""
-        metrics_map = {
-            DeviceType.SMARTWATCH: ['steps', 'heart_rate', 'sleep', 'calories', 'distance'],
-            DeviceType.FITNESS_BAND: ['steps', 'heart_rate', 'sleep', 'calories'],
-            DeviceType.HEART_RATE_MONITOR: ['heart_rate'],
-            DeviceType.BLOOD_PRESSURE: ['systolic', 'diastolic', 'pulse'],
-            DeviceType.SMART_SCALE: ['weight', 'body_fat', 'bmi', 'muscle_mass'],
-            DeviceType.PHONE: ['steps', 'location', 'screen_time'],
-        }
-        return metrics_map.get(device_type, [])
+        return list(_DEFAULT_METRICS.get(device_type, ()))
 
 
 class DeviceCreateSerializer(DeviceSerializer):
     """Serializer for creating devices (simplified)"""
+    # The owner is always the requesting user (DeviceViewSet.perform_create)
+    user_id = None
+    
     class Meta(DeviceSerializer.Meta):
+        include_computed_fields = False
         fields = [
-            'user_id',
             'device_name', 'device_type', 'manufacturer',
             'model', 'serial_number',
             'connection_type',
@@ -256,9 +388,13 @@ class DeviceCreateSerializer(DeviceSerializer):
 
 class DeviceUpdateSerializer(DeviceSerializer):
     """Serializer for updating devices"""
+    # read_only_fields doesn't apply to declared fields, so drop the owner outright
+    user_id = None
+    
     class Meta(DeviceSerializer.Meta):
+        fields = [name for name in DeviceSerializer.Meta.fields if name != 'user_id']
         read_only_fields = DeviceSerializer.Meta.read_only_fields + [
-            'user', 'user_id', 'device_type', 'manufacturer',
+            'user', 'device_type', 'manufacturer',
             'connection_type', 'device_id'
         ]
 
@@ -268,18 +404,30 @@ class DeviceStatusUpdateSerializer(serializers.ModelSerializer):
     class Meta:
         model = Device
         fields = ['battery_level', 'status', 'is_connected', 'firmware_version']
+        # Range is a DB check constraint (battery_0_100), which DRF doesn't map
+        extra_kwargs = {'battery_level': {'min_value': 0, 'max_value': 100}}
     
     def update(self, instance, validated_data):
+        # Status pings are frequent, so write only the columns they touch
+        update_fields = set(validated_data)
+        
         # Update status and track connection time
         if 'status' in validated_data:
             new_status = validated_data['status']
             if new_status == DeviceStatus.CONNECTED:
                 instance.last_connected = timezone.now()
                 instance.is_connected = True
+                update_fields.update(('last_connected', 'is_connected'))
             elif new_status == DeviceStatus.DISCONNECTED:
                 instance.is_connected = False
+                update_fields.add('is_connected')
         
-        return super().update(instance, validated_data)
+        for attr, value in validated_data.items():
+            setattr(instance, attr, value)
+        
+        update_fields.add('updated_at')
+        instance.save(update_fields=update_fields)
+        return instance
 
 
 class DeviceSyncLogSerializer(serializers.ModelSerializer):
@@ -287,37 +435,24 @@ class DeviceSyncLogSerializer(serializers.ModelSerializer):
     device = serializers.StringRelatedField(read_only=True)
     device_id = serializers.PrimaryKeyRelatedField(
         source='device',
-        queryset=Device.objects.all(),
+        queryset=_DEVICE_PK_QUERYSET,
         write_only=True
     )
     
-    # Duration in human readable format
-    duration_display = serializers.SerializerMethodField()
+    # Stored compressed, exposed as plain JSON
+    data_synced = serializers.JSONField(required=False)
+    metrics_count = serializers.JSONField(required=False)
     
     class Meta:
         model = DeviceSyncLog
         fields = [
             'id', 'device', 'device_id',
             'sync_type', 'started_at', 'completed_at',
-            'duration_seconds', 'duration_display',
+            'duration_seconds',
             'status', 'data_synced', 'metrics_count',
             'error_message', 'created_at'
         ]
         read_only_fields = ['created_at']
-    
-    def get_duration_display(self, obj):
-        if not obj.duration_seconds:
-            return None
-        
-        seconds = obj.duration_seconds
-        if seconds < 60:
-            return f"{seconds:.1f}s"
-        elif seconds < 3600:
-            minutes = seconds / 60
-            return f"{minutes:.1f}m"
-        else:
-            hours = seconds / 3600
-            return f"{hours:.2f}h"
 
 
 class DeviceConnectionLogSerializer(serializers.ModelSerializer):
@@ -325,7 +460,7 @@ class DeviceConnectionLogSerializer(serializers.ModelSerializer):
     device = serializers.StringRelatedField(read_only=True)
     device_id = serializers.PrimaryKeyRelatedField(
         source='device',
-        queryset=Device.objects.all(),
+        queryset=_DEVICE_PK_QUERYSET,
         write_only=True
     )
     
@@ -347,37 +482,19 @@ class DeviceConnectionLogSerializer(serializers.ModelSerializer):
             'battery_level', 'created_at'
         ]
         read_only_fields = ['created_at']
+        extra_kwargs = {'battery_level': {'min_value': 0, 'max_value': 100}}
     
     def get_connection_duration(self, obj):
         if not obj.connected_at or not obj.disconnected_at:
             return None
         
-        duration = obj.disconnected_at - obj.connected_at
-        seconds = duration.total_seconds()
-        
-        if seconds < 60:
-            return f"{seconds:.0f}s"
-        elif seconds < 3600:
-            minutes = seconds / 60
-            return f"{minutes:.0f}m"
-        else:
-            hours = seconds / 3600
-            return f"{hours:.1f}h"
+        seconds = (obj.disconnected_at - obj.connected_at).total_seconds()
+        return _humanize(seconds, _CONNECTION_DURATION_UNITS)
     
     def get_signal_strength_display(self, obj):
         if obj.signal_strength is None:
             return None
-        
-        if obj.signal_strength >= 80:
-            return "Excellent"
-        elif obj.signal_strength >= 60:
-            return "Good"
-        elif obj.signal_strength >= 40:
-            return "Fair"
-        elif obj.signal_strength >= 20:
-            return "Poor"
-        else:
-            return "Very Poor"
+        return _SIGNAL_LABELS[bisect_right(_SIGNAL_THRESHOLDS, obj.signal_strength)]
 
 
 class DeviceDataCacheSerializer(serializers.ModelSerializer):
@@ -385,13 +502,12 @@ class DeviceDataCacheSerializer(serializers.ModelSerializer):
     device = serializers.StringRelatedField(read_only=True)
     device_id = serializers.PrimaryKeyRelatedField(
         source='device',
-        queryset=Device.objects.all(),
+        queryset=_DEVICE_PK_QUERYSET,
         write_only=True
     )
     
     # Cache status
     is_expired = serializers.BooleanField(read_only=True)
-    will_expire_in = serializers.SerializerMethodField()
     
     class Meta:
         model = DeviceDataCache
@@ -399,30 +515,9 @@ class DeviceDataCacheSerializer(serializers.ModelSerializer):
             'id', 'device', 'device_id',
             'data_type', 'date', 'data',
             'last_updated', 'expires_at',
-            'is_expired', 'will_expire_in'
+            'is_expired',
         ]
         read_only_fields = ['last_updated']
-    
-    def get_will_expire_in(self, obj):
-        if not obj.expires_at:
-            return None
-        
-        time_until = obj.expires_at - timezone.now()
-        seconds = time_until.total_seconds()
-        
-        if seconds <= 0:
-            return "Expired"
-        elif seconds < 60:
-            return f"{seconds:.0f}s"
-        elif seconds < 3600:
-            minutes = seconds / 60
-            return f"{minutes:.0f}m"
-        elif seconds < 86400:
-            hours = seconds / 3600
-            return f"{hours:.0f}h"
-        else:
-            days = seconds / 86400
-            return f"{days:.0f}d"
 
 
 class DeviceDriverSerializer(serializers.ModelSerializer):
@@ -440,32 +535,130 @@ class DeviceDriverSerializer(serializers.ModelSerializer):
         read_only_fields = ['created_at']
 
 
+class DeviceSyncLogMiniSerializer(serializers.Serializer):
+    """Summary of a sync log embedded in device payloads"""
+    id = serializers.IntegerField()
+    sync_type = serializers.CharField()
+    status = serializers.CharField()
+    started_at = serializers.DateTimeField()
+    duration_seconds = serializers.FloatField()
+    
+    # Columns to load for the fields above (plus the FK the prefetch matches on)
+    load_fields = ('id', 'device', 'sync_type', 'status', 'started_at', 'duration_seconds')
+
+
+class DeviceConnectionLogMiniSerializer(serializers.Serializer):
+    """Summary of a connection log embedded in device payloads"""
+    id = serializers.IntegerField()
+    connection_type = serializers.CharField()
+    status = serializers.CharField()
+    attempted_at = serializers.DateTimeField()
+    signal_strength = serializers.IntegerField()
+    
+    load_fields = ('id', 'device', 'connection_type', 'status', 'attempted_at', 'signal_strength')
+
+
 class DeviceWithLogsSerializer(DeviceSerializer):
     """Device serializer with related logs"""
-    recent_sync_logs = DeviceSyncLogSerializer(many=True, read_only=True)
-    recent_connection_logs = DeviceConnectionLogSerializer(many=True, read_only=True)
+    recent_sync_logs = DeviceSyncLogMiniSerializer(many=True, read_only=True)
+    recent_connection_logs = DeviceConnectionLogMiniSerializer(many=True, read_only=True)
+    
+    # Logs rendered per device
+    RECENT_LOG_LIMIT = 10
     
     class Meta(DeviceSerializer.Meta):
         fields = DeviceSerializer.Meta.fields + ['recent_sync_logs', 'recent_connection_logs']
+    
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        return super().setup_eager_loading(queryset).prefetch_related(
+            Prefetch(
+                'sync_logs',
+                queryset=DeviceSyncLog.objects.select_related(None)
+                .only(*DeviceSyncLogMiniSerializer.load_fields)
+                .order_by('-started_at')[:cls.RECENT_LOG_LIMIT],
+                to_attr='recent_sync_logs',
+            ),
+            Prefetch(
+                'connection_logs',
+                queryset=DeviceConnectionLog.objects.select_related(None)
+                .only(*DeviceConnectionLogMiniSerializer.load_fields)
+                .order_by('-attempted_at')[:cls.RECENT_LOG_LIMIT],
+                to_attr='recent_connection_logs',
+            ),
+        )
 
 
 class DeviceSimpleSerializer(serializers.ModelSerializer):
     """Simplified device serializer for lists"""
-    device_type_display = serializers.CharField(source='get_device_type_display', read_only=True)
-    manufacturer_display = serializers.CharField(source='get_manufacturer_display', read_only=True)
-    status_display = serializers.CharField(source='get_status_display', read_only=True)
-    
     class Meta:
         model = Device
         fields = [
             'id', 'device_name',
-            'device_type', 'device_type_display',
-            'manufacturer', 'manufacturer_display',
+            'device_type',
+            'manufacturer',
             'model', 'connection_type',
             'battery_level', 'is_connected',
-            'status', 'status_display',
+            'status',
             'last_synced', 'created_at'
         ]
+        # Model columns the fields above read; nothing else is loaded
+        list_only_fields = (
+            'id', 'device_name', 'device_type', 'manufacturer', 'model',
+            'connection_type', 'battery_level', 'is_connected', 'status',
+            'last_synced', 'created_at',
+        )
+    
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        """Load only the serialized columns; no user join"""
+        return queryset.select_related(None).only(*cls.Meta.list_only_fields)
+    
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        data['device_type_display'] = _DEVICE_TYPE_LABELS.get(instance.device_type, instance.device_type)
+        data['manufacturer_display'] = _MANUFACTURER_LABELS.get(instance.manufacturer, instance.manufacturer)
+        data['status_display'] = _STATUS_LABELS.get(instance.status, instance.status)
+        return data
+
+
+# Shared formatter so fast-path timestamps match DateTimeField output
+_DATETIME = serializers.DateTimeField()
+
+
+class DeviceListFastSerializer(serializers.Serializer):
+    """
+    Read-only list serializer over Device.objects.values(*FIELDS) rows.
+    Plain dict lookups: no model instances, no per-field get_attribute.
+    """
+    FIELDS = (
+        'id', 'device_name', 'device_type', 'manufacturer', 'model',
+        'connection_type', 'battery_level', 'is_connected', 'status',
+        'last_synced', 'created_at',
+        'user__id', 'user__username', 'user__email',
+    )
+    
+    def to_representation(self, row):
+        to_datetime = _DATETIME.to_representation
+        last_synced = row['last_synced']
+        return {
+            'id': row['id'],
+            'user': {
+                'id': row['user__id'],
+                'username': row['user__username'],
+                'email': row['user__email'],
+            },
+            'device_name': row['device_name'],
+            'device_type': row['device_type'],
+            'manufacturer': row['manufacturer'],
+            'model': row['model'],
+            'connection_type': row['connection_type'],
+            'battery_level': row['battery_level'],
+            'is_connected': row['is_connected'],
+            'status': row['status'],
+            'last_synced': to_datetime(last_synced) if last_synced else None,
+            'created_at': to_datetime(row['created_at']),
+        }
 
 
 class DeviceBulkUpdateSerializer(serializers.Serializer):
@@ -481,11 +674,11 @@ class DeviceBulkUpdateSerializer(serializers.Serializer):
         if not value:
             raise serializers.ValidationError("At least one device ID is required")
         
-        # Check if all devices exist
-        existing_ids = Device.objects.filter(id__in=value).values_list('id', flat=True)
-        non_existing = set(value) - set(existing_ids)
-        
-        if non_existing:
+        # Check if all devices exist; the common case is a single COUNT
+        ids = set(value)
+        devices = Device.objects.filter(id__in=ids)
+        if devices.count() != len(ids):
+            non_existing = ids - set(devices.values_list('id', flat=True))
             raise serializers.ValidationError(
                 f"Devices not found: {list(non_existing)}"
             )
@@ -509,21 +702,7 @@ class DeviceConnectionRequestSerializer(serializers.Serializer):
     api_secret = serializers.CharField(required=False, allow_blank=True)
     
     def validate(self, data):
-        connection_type = data.get('connection_type')
-        
-        if connection_type == ConnectionType.BLUETOOTH:
-            if not data.get('bluetooth_address'):
-                raise serializers.ValidationError({
-                    'bluetooth_address': 'Bluetooth address is required for Bluetooth connection'
-                })
-        
-        elif connection_type == ConnectionType.CLOUD:
-            if not data.get('api_key') or not data.get('api_secret'):
-                raise serializers.ValidationError({
-                    'api_key': 'API key is required for cloud connection',
-                    'api_secret': 'API secret is required for cloud connection'
-                })
-        
+        _validate_connection_fields(data, _REQUEST_CONNECTION_REQUIRED)
         return data
 
 
@@ -550,8 +729,11 @@ __all__ = [
     'DeviceConnectionLogSerializer',
     'DeviceDataCacheSerializer',
     'DeviceDriverSerializer',
+    'DeviceSyncLogMiniSerializer',
+    'DeviceConnectionLogMiniSerializer',
     'DeviceWithLogsSerializer',
     'DeviceSimpleSerializer',
+    'DeviceListFastSerializer',
     'DeviceBulkUpdateSerializer',
     'DeviceConnectionRequestSerializer',
     'DeviceSyncRequestSerializer',
@@ -1,3 +1,173 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.core.cache import cache
 from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from users.models import User
+from .models import Device, DeviceType, DeviceManufacturer, ConnectionType
+from .serializers import DeviceCreateSerializer
+from .token_manager import TokenManager
+
+
+class DeviceOwnershipTests(APITestCase):
+    """Devices are only ever created for, and visible to, their owner"""
+
+    def setUp(self):
+        self.alice = User.objects.create_user('alice', 'alice@example.com', 'pass')
+        self.bob = User.objects.create_user('bob', 'bob@example.com', 'pass')
+        self.device = Device.objects.create(
+            user=self.alice,
+            device_name='Alice Watch',
+            device_type=DeviceType.SMARTWATCH,
+            connection_type=ConnectionType.USB,
+        )
+        self.client.force_authenticate(self.alice)
+
+    def test_create_ignores_user_id(self):
+        response = self.client.post(reverse('devices-list'), {
+            'user_id': self.bob.pk,
+            'device_name': 'New Band',
+            'device_type': DeviceType.FITNESS_BAND,
+            'connection_type': ConnectionType.USB,
+        }, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        device = Device.objects.get(device_name='New Band')
+        self.assertEqual(device.user_id, self.alice.pk)
+
+    def test_create_rejects_own_duplicate_bluetooth_address(self):
+        payload = {
+            'device_name': 'Band',
+            'device_type': DeviceType.FITNESS_BAND,
+            'connection_type': ConnectionType.BLUETOOTH,
+            'bluetooth_address': 'AA:BB:CC:DD:EE:FF',
+        }
+        url = reverse('devices-list')
+
+        self.assertEqual(self.client.post(url, payload, format='json').status_code, status.HTTP_201_CREATED)
+        response = self.client.post(url, payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('bluetooth_address', response.json())
+
+        # The address is only unique per user
+        self.client.force_authenticate(self.bob)
+        self.assertEqual(self.client.post(url, payload, format='json').status_code, status.HTTP_201_CREATED)
+
+    def test_create_allows_repeated_blank_identifiers(self):
+        payload = {
+            'device_type': DeviceType.SMART_SCALE,
+            'connection_type': ConnectionType.WIFI,
+            'wifi_mac_address': '11:22:33:44:55:66',
+            'bluetooth_address': '',
+            'device_id': '',
+        }
+        url = reverse('devices-list')
+
+        for name in ('Scale 1', 'Scale 2'):
+            response = self.client.post(url, {**payload, 'device_name': name}, format='json')
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        devices = Device.objects.filter(device_name__startswith='Scale')
+        self.assertEqual(devices.count(), 2)
+        self.assertFalse(devices.exclude(bluetooth_address=None, device_id=None).exists())
+
+    def test_duplicate_check_without_request_is_a_validation_error(self):
+        serializer = DeviceCreateSerializer(data={
+            'device_name': 'Band',
+            'device_type': DeviceType.FITNESS_BAND,
+            'connection_type': ConnectionType.BLUETOOTH,
+            'bluetooth_address': 'AA:BB:CC:DD:EE:FF',
+        })
+
+        self.assertFalse(serializer.is_valid())
+        self.assertIn('user', serializer.errors)
+
+    def test_update_cannot_change_owner(self):
+        url = reverse('devices-detail', args=[self.device.pk])
+        response = self.client.patch(url, {
+            'user_id': self.bob.pk,
+            'device_name': 'Renamed',
+        }, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.device.refresh_from_db()
+        self.assertEqual(self.device.user_id, self.alice.pk)
+        self.assertEqual(self.device.device_name, 'Renamed')
+
+    def test_other_users_device_is_not_found(self):
+        self.client.force_authenticate(self.bob)
+        url = reverse('devices-detail', args=[self.device.pk])
+
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(
+            self.client.patch(url, {'device_name': 'Taken'}, format='json').status_code,
+            status.HTTP_404_NOT_FOUND
+        )
+        self.assertEqual(self.client.delete(url).status_code, status.HTTP_404_NOT_FOUND)
+        self.assertTrue(Device.objects.filter(pk=self.device.pk, user=self.alice).exists())
+
+    def test_list_only_returns_own_devices(self):
+        Device.objects.create(
+            user=self.bob,
+            device_name='Bob Scale',
+            device_type=DeviceType.SMART_SCALE,
+            connection_type=ConnectionType.USB,
+        )
+
+        response = self.client.get(reverse('devices-list'))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([device['id'] for device in response.json()], [self.device.pk])
+
+
+class TokenRefreshTests(TestCase):
+    """Refreshes start from the stored tokens, not the caller's copy"""
+
+    def setUp(self):
+        cache.clear()
+        user = User.objects.create_user('alice', 'alice@example.com', 'pass')
+        self.device = Device.objects.create(
+            user=user,
+            device_name='Alice Fitbit',
+            device_type=DeviceType.FITNESS_BAND,
+            manufacturer=DeviceManufacturer.FITBIT,
+            connection_type=ConnectionType.CLOUD,
+            access_token='old-access',
+            refresh_token='old-refresh',
+            token_expires_at=timezone.now() - timedelta(minutes=1),
+        )
+        self.api_class = mock.Mock()
+        patcher = mock.patch('devices.token_manager._PROVIDERS', (('fitbit', self.api_class),))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_reuses_tokens_saved_by_another_worker(self):
+        stale = Device.objects.get(pk=self.device.pk)
+        fresh_expiry = timezone.now() + timedelta(hours=1)
+        Device.objects.filter(pk=self.device.pk).update(
+            access_token='new-access', refresh_token='new-refresh', token_expires_at=fresh_expiry
+        )
+
+        self.assertTrue(TokenManager().refresh_token_if_needed(stale))
+
+        self.api_class.return_value.refresh_token.assert_not_called()
+        self.assertEqual((stale.access_token, stale.refresh_token), ('new-access', 'new-refresh'))
+
+    def test_refreshes_with_the_stored_refresh_token(self):
+        stale = Device.objects.get(pk=self.device.pk)
+        Device.objects.filter(pk=self.device.pk).update(refresh_token='rotated-refresh')
+        self.api_class.return_value.refresh_token.return_value = {
+            'access_token': 'new-access', 'refresh_token': 'newer-refresh', 'expires_in': 3600,
+        }
+
+        self.assertTrue(TokenManager().refresh_token_if_needed(stale))
 
-# Create your tests here.
+        self.api_class.return_value.refresh_token.assert_called_once_with('rotated-refresh')
+        self.device.refresh_from_db()
+        self.assertEqual(self.device.access_token, 'new-access')
+        self.assertEqual(self.device.refresh_token, 'newer-refresh')
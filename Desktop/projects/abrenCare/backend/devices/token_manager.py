@@ -1,5 +1,8 @@
 import logging
+import threading
+from concurrent.futures import Future
 from datetime import timedelta
+from django.core.cache import cache
 from django.utils import timezone
 from typing import Optional, Dict, Any
 
@@ -9,10 +12,38 @@ from integrations.apple_health import AppleHealthAPI
 
 logger = logging.getLogger(__name__)
 
+# Manufacturer substring -> provider API, checked in order
+_PROVIDERS = (
+    ('fitbit', FitbitAPI),
+    ('garmin', GarminAPI),
+    ('apple', AppleHealthAPI),
+)
+
+# Seconds a refresh may hold the per-device lock
+_REFRESH_LOCK_TIMEOUT = 30
+
+# Refresh tokens that expire within this window
+_REFRESH_MARGIN = timedelta(minutes=5)
+
+_now = timezone.now
+
+
+def _provider_for(device):
+    """Return (provider name, API class or None) for a device"""
+    name = (device.manufacturer or '').lower()
+    for prefix, api_class in _PROVIDERS:
+        if prefix in name:
+            return name, api_class
+    return name, None
+
 
 class TokenManager:
     """Manage OAuth token lifecycle"""
     
+    # device id -> Future of the refresh currently running in this process
+    _inflight: Dict[int, Future] = {}
+    _inflight_lock = threading.Lock()
+    
     def refresh_token_if_needed(self, device) -> bool:
         """Refresh OAuth token if expired or about to expire"""
         
@@ -20,34 +51,78 @@ class TokenManager:
             return False
         
         # Check if token is expired or expires soon (within 5 minutes)
-        if device.token_expiry and device.token_expiry > timezone.now() + timedelta(minutes=5):
+        if device.token_expires_at and device.token_expires_at > _now() + _REFRESH_MARGIN:
             return True
         
+        provider_name, api_class = _provider_for(device)
+        if api_class is None:
+            logger.warning(f"No token refresh implementation for {provider_name}")
+            return False
+        
+        # Callers in this process share one in-flight refresh per device
+        with self._inflight_lock:
+            future = self._inflight.get(device.id)
+            owner = future is None
+            if owner:
+                future = self._inflight[device.id] = Future()
+        
+        if owner:
+            try:
+                future.set_result(self._refresh(device, api_class))
+            except BaseException as e:
+                future.set_exception(e)
+            finally:
+                with self._inflight_lock:
+                    self._inflight.pop(device.id, None)
+        
+        new_state = future.result()
+        if new_state is None:
+            return False
+        
+        # Waiters hold their own Device instance; bring it up to date
+        device.access_token, device.refresh_token, device.token_expires_at = new_state
+        return True
+    
+    def _refresh(self, device, api_class):
+        """
+        Call the provider and save the new tokens. Returns the saved
+        (access_token, refresh_token, token_expires_at), or None on failure.
+        """
+        # One refresh per device across workers; cache.add is atomic
+        lock_key = f'token_lock:{device.id}'
+        if not cache.add(lock_key, 1, timeout=_REFRESH_LOCK_TIMEOUT):
+            logger.info(f"Token refresh already in progress for device {device.id}")
+            if device.token_expires_at and device.token_expires_at > _now():
+                return device.access_token, device.refresh_token, device.token_expires_at
+            return None
+        
         try:
-            device_type_name = device.device_type.name.lower()
+            # Another worker may have refreshed (and rotated the refresh token)
+            # since this instance was loaded; reuse its tokens if still fresh.
+            # The default manager joins user, which fields= can't be combined with.
+            device.refresh_from_db(
+                from_queryset=type(device).objects.select_related(None),
+                fields=['access_token', 'refresh_token', 'token_expires_at'],
+            )
+            if device.token_expires_at and device.token_expires_at > _now() + _REFRESH_MARGIN:
+                return device.access_token, device.refresh_token, device.token_expires_at
             
-            if 'fitbit' in device_type_name:
-                new_tokens = FitbitAPI.refresh_token(device.refresh_token)
-            elif 'garmin' in device_type_name:
-                new_tokens = GarminAPI.refresh_token(device.refresh_token)
-            elif 'apple' in device_type_name:
-                new_tokens = AppleHealthAPI.refresh_token(device.refresh_token)
-            else:
-                logger.warning(f"No token refresh implementation for {device_type_name}")
-                return False
+            new_tokens = api_class().refresh_token(device.refresh_token)
             
             # Update device with new tokens
             device.access_token = new_tokens['access_token']
             device.refresh_token = new_tokens.get('refresh_token', device.refresh_token)
-            device.token_expiry = timezone.now() + timedelta(seconds=new_tokens['expires_in'])
-            device.save()
+            device.token_expires_at = _now() + timedelta(seconds=new_tokens['expires_in'])
+            device.save(update_fields=['access_token', 'refresh_token', 'token_expires_at', 'updated_at'])
             
             logger.info(f"Successfully refreshed tokens for device {device.id}")
-            return True
+            return device.access_token, device.refresh_token, device.token_expires_at
             
         except Exception as e:
             logger.error(f"Failed to refresh tokens for device {device.id}: {e}")
-            return False
+            return None
+        finally:
+            cache.delete(lock_key)
     
     def revoke_tokens(self, device) -> bool:
         """Revoke OAuth tokens from provider"""
@@ -56,16 +131,12 @@ class TokenManager:
             return True
         
         try:
-            device_type_name = device.device_type.name.lower()
+            provider_name, api_class = _provider_for(device)
             
-            if 'fitbit' in device_type_name:
-                success = FitbitAPI.revoke_tokens(device.access_token)
-            elif 'garmin' in device_type_name:
-                success = GarminAPI.revoke_tokens(device)
-            elif 'apple' in device_type_name:
-                success = AppleHealthAPI.revoke_tokens(device)
+            if api_class is not None:
+                success = api_class().revoke_tokens(device)
             else:
-                logger.warning(f"No token revocation for {device_type_name}")
+                logger.warning(f"No token revocation for {provider_name}")
                 success = True
             
             if success:
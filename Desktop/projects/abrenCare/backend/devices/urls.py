@@ -1,6 +1,17 @@
 from django.urls import path
+from .views import DeviceViewSet
 
 
 urlpatterns = [
-    
+    path('devices/', DeviceViewSet.as_view({
+        'get': 'list',
+        'post': 'create'
+    }), name='devices-list'),
+    path('devices/<int:pk>/', DeviceViewSet.as_view({
+        'get': 'retrieve',
+        'put': 'update',
+        'patch': 'partial_update',
+        'delete': 'destroy'
+    }), name='devices-detail'),
+    path('devices/export/', DeviceViewSet.as_view({'get': 'export'}), name='devices-export'),
 ]
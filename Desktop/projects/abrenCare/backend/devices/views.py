@@ -0,0 +1,59 @@
+from django.http import StreamingHttpResponse
+from rest_framework import viewsets, permissions
+from rest_framework.decorators import action
+from rest_framework.renderers import BrowsableAPIRenderer
+
+from .models import Device
+from .permissions import IsDeviceOwner
+from .renderers import ORJSONRenderer
+from .serializers import (
+    DeviceSerializer, DeviceCreateSerializer, DeviceUpdateSerializer,
+    DeviceListFastSerializer, DeviceSimpleSerializer
+)
+
+
+class DeviceViewSet(viewsets.ModelViewSet):
+    """ViewSet for the current user's devices"""
+    serializer_class = DeviceSerializer
+    permission_classes = [permissions.IsAuthenticated, IsDeviceOwner]
+    renderer_classes = [ORJSONRenderer, BrowsableAPIRenderer]
+    
+    # Rows fetched per round trip when streaming an export
+    EXPORT_CHUNK_SIZE = 500
+    
+    def get_queryset(self):
+        # Ownership is enforced in the query, so no per-object user lookup is needed
+        queryset = Device.objects.filter(user=self.request.user)
+        if self.action == 'list':
+            # Plain dicts for the list; full instances only for detail/write
+            return queryset.values(*DeviceListFastSerializer.FIELDS)
+        return self.get_serializer_class().setup_eager_loading(queryset)
+    
+    def get_serializer_class(self):
+        if self.action == 'list':
+            return DeviceListFastSerializer
+        if self.action == 'export':
+            return DeviceSimpleSerializer
+        if self.action == 'create':
+            return DeviceCreateSerializer
+        if self.action in ('update', 'partial_update'):
+            return DeviceUpdateSerializer
+        return DeviceSerializer
+    
+    def perform_create(self, serializer):
+        serializer.save(user=self.request.user)
+    
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        """Stream all of the user's devices as a JSON array"""
+        serializer_class = self.get_serializer_class()
+        renderer = ORJSONRenderer()
+        devices = self.get_queryset().order_by('id').iterator(chunk_size=self.EXPORT_CHUNK_SIZE)
+        
+        def rows():
+            yield b'['
+            for index, device in enumerate(devices):
+                yield (b',' if index else b'') + renderer.render(serializer_class(device).data)
+            yield b']'
+        
+        return StreamingHttpResponse(rows(), content_type='application/json')
@@ -1,6 +1,11 @@
-import numpy as np
+import copy
 import logging
+import threading
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from dataclasses import dataclass
 from datetime import datetime, timedelta
+from types import MappingProxyType
 from typing import List, Dict, Any, Optional, Tuple
 from django.utils import timezone
 from django.db.models import Sum, Avg, Max, Count, Q
@@ -9,13 +14,186 @@ from .models import Activity, HeartRateReading, DailySummary
 
 logger = logging.getLogger(__name__)
 
+# MET (Metabolic Equivalent of Task) values per activity type
+MET_VALUES = {
+    'walking': 3.5,
+    'running': 8.0,
+    'cycling': 7.5,
+    'swimming': 6.0,
+    'hiking': 6.0,
+    'yoga': 2.5,
+    'strength_training': 6.0,
+    'hiit': 8.5,
+    'dancing': 5.0,
+    'sports': 7.0,
+    'workout': 6.5,
+    'other': 4.0
+}
+
+# Expected calories burned per minute (min, max) per activity type
+EXPECTED_CALORIE_RANGES = {
+    'walking': (4.0, 6.0),
+    'running': (10.0, 16.0),
+    'cycling': (8.0, 12.0),
+    'swimming': (8.0, 14.0),
+    'hiking': (6.0, 10.0),
+    'yoga': (3.0, 5.0),
+    'strength_training': (6.0, 9.0),
+    'hiit': (12.0, 18.0),
+    'dancing': (5.0, 8.0),
+    'sports': (7.0, 12.0),
+    'workout': (6.0, 10.0),
+    'other': (4.0, 7.0)
+}
+
+# Upper bound (min/km, inclusive) of the fast and moderate pace bands
+PACE_THRESHOLDS = {
+    'walking': (10.0, 15.0),
+    'running': (5.0, 6.5),
+    'cycling': (3.0, 4.0)
+}
+PACE_LEVELS = ('fast', 'moderate', 'slow')
+
+# Lower bound (km, inclusive) of the moderate and long distance bands
+DISTANCE_THRESHOLDS = {
+    'walking': (3.0, 5.0),
+    'running': (5.0, 10.0),
+    'cycling': (15.0, 30.0),
+    'swimming': (0.5, 1.5)
+}
+DISTANCE_LEVELS = ('short', 'moderate', 'long')
+
+# Intensities that count towards the WHO weekly activity guideline
+GUIDELINE_INTENSITIES = frozenset(('moderate', 'vigorous', 'maximal'))
+
+WEEKDAY_NAMES = ('Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday')
+
+# Threshold ladders, looked up with bisect_right (np.searchsorted(..., side='right')
+# for arrays): entry i of each table applies from threshold i-1 (inclusive) up to
+# threshold i.
+
+# Heart rate is stored in whole bpm; each threshold is the first bpm of a band
+HR_BAND_STARTS = (100, 121, 141, 161)
+HR_MULTIPLIERS = (0.9, 1.0, 1.1, 1.2, 1.3)
+
+MET_LEVEL_THRESHOLDS = (3.0, 6.0, 8.0)
+MET_LEVELS = (
+    ('very_light', 'Very light activity'),
+    ('light', 'Light intensity activity'),
+    ('moderate', 'Moderate intensity activity'),
+    ('vigorous', 'Very high intensity activity'),
+)
+
+INTENSITY_MINUTE_THRESHOLDS = (3.0, 6.0)
+INTENSITY_MINUTE_FACTORS = ((0, 'light'), (1, 'moderate'), (2, 'vigorous'))
+
+TRAINING_LOAD_THRESHOLDS = (2000, 4000, 6000)
+RECOVERY_LEVELS = ((12, 'light'), (24, 'moderate'), (36, 'hard'), (48, 'very_hard'))
+
+
+# Fixed recommendation templates; results get copies (see _generate_activity_recommendations)
+INTENSITY_RECOMMENDATION = MappingProxyType({
+    'category': 'intensity',
+    'priority': 'medium',
+    'title': 'Increase Activity Intensity',
+    'description': 'Consider adding more vigorous activities to your routine.',
+    'actions': (
+        'Add intervals to your workouts',
+        'Try new activities that challenge you',
+        'Gradually increase duration and intensity'
+    )
+})
+
+EFFICIENCY_RECOMMENDATION = MappingProxyType({
+    'category': 'efficiency',
+    'priority': 'low',
+    'title': 'Improve Exercise Efficiency',
+    'description': 'Your calorie burn is lower than expected for this activity type.',
+    'actions': (
+        'Focus on proper form and technique',
+        'Increase resistance or incline',
+        'Maintain consistent pace throughout'
+    )
+})
+
+RECOVERY_RECOMMENDATION = MappingProxyType({
+    'category': 'recovery',
+    'priority': 'high',
+    'title': 'Prioritize Recovery',
+    'description': 'This was a demanding workout that requires proper recovery.',
+    'actions': (
+        'Stay hydrated and eat nutrient-rich foods',
+        'Consider foam rolling or massage',
+        'Get extra sleep tonight'
+    )
+})
+
+# Results for activities without the inputs an analyzer needs; callers get copies
+NO_HEART_RATE_ANALYSIS = MappingProxyType({
+    'status': 'no_data',
+    'message': 'No heart rate data available for this activity'
+})
+
+NO_PERFORMANCE_ANALYSIS = MappingProxyType({
+    'pace_analysis': MappingProxyType({}),
+    'distance_analysis': MappingProxyType({}),
+    'efficiency_analysis': MappingProxyType({})
+})
+
+# (analysis section, field, triggering values, recommendation), in output order
+ACTIVITY_RECOMMENDATION_RULES = (
+    ('intensity_analysis', 'intensity_level', ('very_light',), INTENSITY_RECOMMENDATION),
+    ('calorie_analysis', 'efficiency', ('low',), EFFICIENCY_RECOMMENDATION),
+    ('recovery_analysis', 'recovery_level', ('hard', 'very_hard'), RECOVERY_RECOMMENDATION),
+)
+
+
+
+@dataclass(slots=True, frozen=True)
+class ActivityAnalysisResult:
+    """Intensity and recovery figures for one activity from analyze_activities"""
+    
+    activity_id: Any
+    activity_type: str
+    met_value: float
+    intensity_level: str
+    intensity_description: str
+    intensity_minutes: int
+    intensity_type: str
+    base_met: float
+    heart_rate_adjustment: float
+    training_load: float
+    estimated_recovery_hours: int
+    recovery_level: str
+    
+    @property
+    def recovery_recommendations(self) -> List[str]:
+        return ActivityProcessor._recovery_recommendations(self.recovery_level, self.activity_type)
+    
+    @property
+    def next_workout_timing(self) -> str:
+        return f'Consider waiting {self.estimated_recovery_hours} hours before next intense workout'
+
 
 class ActivityProcessor:
     """Process and analyze activity data"""
     
     @staticmethod
     def analyze_activity(activity: Activity) -> Dict[str, Any]:
-        """Analyze a single activity"""
+        """Analyze a single activity
+        
+        Results for saved activities are cached by (id, updated_at); each
+        caller gets its own copy.
+        """
+        
+        if activity.updated_at is None:
+            return ActivityProcessor._analyze_activity_uncached(activity)
+        
+        return _cached_analysis(activity)
+    
+    @staticmethod
+    def _analyze_activity_uncached(activity: Activity) -> Dict[str, Any]:
+        """Run every per-activity analyzer"""
         
         analysis = {
             'intensity_analysis': {},
@@ -33,10 +211,18 @@ class ActivityProcessor:
         analysis['calorie_analysis'] = ActivityProcessor._analyze_calories(activity)
         
         # Analyze heart rate during activity
-        analysis['heart_rate_analysis'] = ActivityProcessor._analyze_heart_rate_during_activity(activity)
+        if activity.avg_heart_rate:
+            analysis['heart_rate_analysis'] = ActivityProcessor._analyze_heart_rate_during_activity(activity)
+        else:
+            analysis['heart_rate_analysis'] = dict(NO_HEART_RATE_ANALYSIS)
         
-        # Analyze performance
-        analysis['performance_analysis'] = ActivityProcessor._analyze_performance(activity)
+        # Analyze performance (every metric needs distance or steps)
+        if activity.distance_km or activity.steps:
+            analysis['performance_analysis'] = ActivityProcessor._analyze_performance(activity)
+        else:
+            analysis['performance_analysis'] = {
+                section: dict(result) for section, result in NO_PERFORMANCE_ANALYSIS.items()
+            }
         
         # Analyze recovery needs
         analysis['recovery_analysis'] = ActivityProcessor._analyze_recovery(activity)
@@ -46,67 +232,83 @@ class ActivityProcessor:
         
         return analysis
     
+    @staticmethod
+    def analyze_activities(activities) -> List[ActivityAnalysisResult]:
+        """Analyze intensity and recovery for many activities in one pass"""
+        
+        import numpy as np
+        
+        rows = list(activities.values_list('id', 'activity_type', 'avg_heart_rate', 'duration_minutes'))
+        if not rows:
+            return []
+        
+        ids, activity_types, heart_rates, durations = zip(*rows)
+        heart_rate = np.array(heart_rates, dtype=float)  # missing readings become nan
+        duration = np.array(durations, dtype=float)
+        has_heart_rate = np.nan_to_num(heart_rate) != 0
+        
+        # Look up the base MET once per distinct activity type
+        types, type_index = np.unique(activity_types, return_inverse=True)
+        base_met = np.array([MET_VALUES.get(t, 4.0) for t in types])[type_index]
+        
+        multiplier = np.where(
+            has_heart_rate,
+            np.take(HR_MULTIPLIERS, np.searchsorted(HR_BAND_STARTS, heart_rate, side='right')),
+            1.0
+        )
+        met = base_met * multiplier
+        level_index = np.searchsorted(MET_LEVEL_THRESHOLDS, met, side='right')
+        minutes_index = np.searchsorted(INTENSITY_MINUTE_THRESHOLDS, met, side='right')
+        
+        # Simplified TRIMP: duration * average HR, estimating 120 bpm when unknown
+        training_load = duration * np.where(has_heart_rate, heart_rate, 120)
+        recovery_index = np.searchsorted(TRAINING_LOAD_THRESHOLDS, training_load, side='right')
+        
+        results = []
+        for i, activity_id in enumerate(ids):
+            intensity_level, intensity_description = MET_LEVELS[level_index[i]]
+            minutes_factor, intensity_type = INTENSITY_MINUTE_FACTORS[minutes_index[i]]
+            recovery_hours, recovery_level = RECOVERY_LEVELS[recovery_index[i]]
+            
+            results.append(ActivityAnalysisResult(
+                activity_id=activity_id,
+                activity_type=activity_types[i],
+                met_value=round(float(met[i]), 1),
+                intensity_level=intensity_level,
+                intensity_description=intensity_description,
+                intensity_minutes=durations[i] * minutes_factor,
+                intensity_type=intensity_type,
+                base_met=float(base_met[i]),
+                heart_rate_adjustment=float(multiplier[i]),
+                training_load=round(float(training_load[i]), 1),
+                estimated_recovery_hours=recovery_hours,
+                recovery_level=recovery_level
+            ))
+        
+        return results
+    
     @staticmethod
     def _analyze_intensity(activity: Activity) -> Dict[str, Any]:
         """Analyze activity intensity"""
         
-        # Calculate MET (Metabolic Equivalent of Task) values
-        met_values = {
-            'walking': 3.5,
-            'running': 8.0,
-            'cycling': 7.5,
-            'swimming': 6.0,
-            'hiking': 6.0,
-            'yoga': 2.5,
-            'strength_training': 6.0,
-            'hiit': 8.5,
-            'dancing': 5.0,
-            'sports': 7.0,
-            'workout': 6.5,
-            'other': 4.0
-        }
-        
-        base_met = met_values.get(activity.activity_type, 4.0)
+        base_met = MET_VALUES.get(activity.activity_type, 4.0)
         
         # Adjust based on heart rate if available
         intensity_multiplier = 1.0
         if activity.avg_heart_rate:
-            if activity.avg_heart_rate > 160:
-                intensity_multiplier = 1.3
-            elif activity.avg_heart_rate > 140:
-                intensity_multiplier = 1.2
-            elif activity.avg_heart_rate > 120:
-                intensity_multiplier = 1.1
-            elif activity.avg_heart_rate < 100:
-                intensity_multiplier = 0.9
+            intensity_multiplier = HR_MULTIPLIERS[bisect_right(HR_BAND_STARTS, activity.avg_heart_rate)]
         
         met = base_met * intensity_multiplier
         
         # Classify intensity
-        if met >= 8.0:
-            intensity_level = 'vigorous'
-            intensity_description = 'Very high intensity activity'
-        elif met >= 6.0:
-            intensity_level = 'moderate'
-            intensity_description = 'Moderate intensity activity'
-        elif met >= 3.0:
-            intensity_level = 'light'
-            intensity_description = 'Light intensity activity'
-        else:
-            intensity_level = 'very_light'
-            intensity_description = 'Very light activity'
+        intensity_level, intensity_description = MET_LEVELS[bisect_right(MET_LEVEL_THRESHOLDS, met)]
         
         # Calculate intensity minutes (for health guidelines)
-        # Moderate = MET 3.0-5.9, Vigorous = MET >= 6.0
-        if met >= 6.0:
-            intensity_minutes = activity.duration_minutes * 2  # Vigorous counts double
-            intensity_type = 'vigorous'
-        elif met >= 3.0:
-            intensity_minutes = activity.duration_minutes
-            intensity_type = 'moderate'
-        else:
-            intensity_minutes = 0
-            intensity_type = 'light'
+        # Moderate = MET 3.0-5.9, Vigorous = MET >= 6.0 (counts double)
+        minutes_factor, intensity_type = INTENSITY_MINUTE_FACTORS[
+            bisect_right(INTENSITY_MINUTE_THRESHOLDS, met)
+        ]
+        intensity_minutes = activity.duration_minutes * minutes_factor
         
         return {
             'met_value': round(met, 1),
@@ -126,22 +328,7 @@ class ActivityProcessor:
         calories_per_minute = activity.calories_per_minute
         
         # Compare with expected values
-        expected_ranges = {
-            'walking': (4.0, 6.0),
-            'running': (10.0, 16.0),
-            'cycling': (8.0, 12.0),
-            'swimming': (8.0, 14.0),
-            'hiking': (6.0, 10.0),
-            'yoga': (3.0, 5.0),
-            'strength_training': (6.0, 9.0),
-            'hiit': (12.0, 18.0),
-            'dancing': (5.0, 8.0),
-            'sports': (7.0, 12.0),
-            'workout': (6.0, 10.0),
-            'other': (4.0, 7.0)
-        }
-        
-        expected_min, expected_max = expected_ranges.get(activity.activity_type, (4.0, 7.0))
+        expected_min, expected_max = EXPECTED_CALORIE_RANGES.get(activity.activity_type, (4.0, 7.0))
         
         efficiency = 'optimal'
         if calories_per_minute < expected_min:
@@ -173,7 +360,7 @@ class ActivityProcessor:
         """Analyze heart rate during activity"""
         
         if not activity.avg_heart_rate:
-            return {'status': 'no_data', 'message': 'No heart rate data available for this activity'}
+            return dict(NO_HEART_RATE_ANALYSIS)
         
         # Get heart rate zones
         zones = ActivityProcessor._calculate_heart_rate_zones(activity)
@@ -287,46 +474,21 @@ class ActivityProcessor:
     def _evaluate_pace(activity_type: str, pace: float) -> Dict[str, Any]:
         """Evaluate pace for different activity types"""
         
-        pace_ranges = {
-            'walking': {'fast': (8.0, 10.0), 'moderate': (10.0, 15.0), 'slow': (15.0, 20.0)},
-            'running': {'fast': (4.0, 5.0), 'moderate': (5.0, 6.5), 'slow': (6.5, 8.0)},
-            'cycling': {'fast': (2.0, 3.0), 'moderate': (3.0, 4.0), 'slow': (4.0, 5.0)}  # min/km
-        }
-        
-        if activity_type not in pace_ranges:
+        if activity_type not in PACE_THRESHOLDS:
             return {'status': 'not_applicable', 'message': 'Pace evaluation not available for this activity'}
         
-        ranges = pace_ranges[activity_type]
-        
-        if pace <= ranges['fast'][1]:
-            return {'status': 'fast', 'message': f'Fast pace for {activity_type}'}
-        elif pace <= ranges['moderate'][1]:
-            return {'status': 'moderate', 'message': f'Moderate pace for {activity_type}'}
-        else:
-            return {'status': 'slow', 'message': f'Slow pace for {activity_type}'}
+        status = PACE_LEVELS[bisect_left(PACE_THRESHOLDS[activity_type], pace)]
+        return {'status': status, 'message': f'{status.capitalize()} pace for {activity_type}'}
     
     @staticmethod
     def _evaluate_distance(activity_type: str, distance: float) -> Dict[str, Any]:
         """Evaluate distance for different activity types"""
         
-        distance_ranges = {
-            'walking': {'long': (5.0, float('inf')), 'moderate': (3.0, 5.0), 'short': (0, 3.0)},
-            'running': {'long': (10.0, float('inf')), 'moderate': (5.0, 10.0), 'short': (0, 5.0)},
-            'cycling': {'long': (30.0, float('inf')), 'moderate': (15.0, 30.0), 'short': (0, 15.0)},
-            'swimming': {'long': (1.5, float('inf')), 'moderate': (0.5, 1.5), 'short': (0, 0.5)}
-        }
-        
-        if activity_type not in distance_ranges:
+        if activity_type not in DISTANCE_THRESHOLDS:
             return {'status': 'not_applicable', 'message': 'Distance evaluation not available for this activity'}
         
-        ranges = distance_ranges[activity_type]
-        
-        if distance >= ranges['long'][0]:
-            return {'status': 'long', 'message': f'Long distance for {activity_type}'}
-        elif distance >= ranges['moderate'][0]:
-            return {'status': 'moderate', 'message': f'Moderate distance for {activity_type}'}
-        else:
-            return {'status': 'short', 'message': f'Short distance for {activity_type}'}
+        status = DISTANCE_LEVELS[bisect_right(DISTANCE_THRESHOLDS[activity_type], distance)]
+        return {'status': status, 'message': f'{status.capitalize()} distance for {activity_type}'}
     
     @staticmethod
     def _evaluate_cadence(steps_per_minute: float) -> Dict[str, Any]:
@@ -353,95 +515,48 @@ class ActivityProcessor:
             training_load = activity.duration_minutes * 120  # Estimate
         
         # Estimate recovery time based on training load and intensity
-        if training_load < 2000:
-            recovery_hours = 12
-            recovery_level = 'light'
-        elif training_load < 4000:
-            recovery_hours = 24
-            recovery_level = 'moderate'
-        elif training_load < 6000:
-            recovery_hours = 36
-            recovery_level = 'hard'
-        else:
-            recovery_hours = 48
-            recovery_level = 'very_hard'
-        
-        # Generate recovery recommendations
-        recommendations = []
-        if recovery_level in ['hard', 'very_hard']:
-            recommendations.append('Consider active recovery (light walking, stretching) tomorrow')
-            recommendations.append('Ensure adequate protein intake for muscle repair')
-            recommendations.append('Get extra sleep tonight')
-        
-        if activity.activity_type == 'strength_training':
-            recommendations.append('Allow 48 hours before working same muscle groups again')
+        recovery_hours, recovery_level = RECOVERY_LEVELS[bisect_right(TRAINING_LOAD_THRESHOLDS, training_load)]
         
         return {
             'training_load': round(training_load, 1),
             'estimated_recovery_hours': recovery_hours,
             'recovery_level': recovery_level,
-            'recovery_recommendations': recommendations,
+            'recovery_recommendations': ActivityProcessor._recovery_recommendations(
+                recovery_level, activity.activity_type
+            ),
             'next_workout_timing': f'Consider waiting {recovery_hours} hours before next intense workout'
         }
     
     @staticmethod
-    def _generate_activity_recommendations(analysis: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Generate activity recommendations"""
+    def _recovery_recommendations(recovery_level: str, activity_type: str) -> List[str]:
+        """Generate recovery recommendations"""
         
         recommendations = []
+        if recovery_level in ['hard', 'very_hard']:
+            recommendations.append('Consider active recovery (light walking, stretching) tomorrow')
+            recommendations.append('Ensure adequate protein intake for muscle repair')
+            recommendations.append('Get extra sleep tonight')
         
-        # Intensity recommendations
-        intensity_analysis = analysis.get('intensity_analysis', {})
-        if intensity_analysis.get('intensity_level') == 'very_light':
-            recommendations.append({
-                'category': 'intensity',
-                'priority': 'medium',
-                'title': 'Increase Activity Intensity',
-                'description': 'Consider adding more vigorous activities to your routine.',
-                'actions': [
-                    'Add intervals to your workouts',
-                    'Try new activities that challenge you',
-                    'Gradually increase duration and intensity'
-                ]
-            })
-        
-        # Calorie efficiency recommendations
-        calorie_analysis = analysis.get('calorie_analysis', {})
-        if calorie_analysis.get('efficiency') == 'low':
-            recommendations.append({
-                'category': 'efficiency',
-                'priority': 'low',
-                'title': 'Improve Exercise Efficiency',
-                'description': 'Your calorie burn is lower than expected for this activity type.',
-                'actions': [
-                    'Focus on proper form and technique',
-                    'Increase resistance or incline',
-                    'Maintain consistent pace throughout'
-                ]
-            })
-        
-        # Recovery recommendations
-        recovery_analysis = analysis.get('recovery_analysis', {})
-        if recovery_analysis.get('recovery_level') in ['hard', 'very_hard']:
-            recommendations.append({
-                'category': 'recovery',
-                'priority': 'high',
-                'title': 'Prioritize Recovery',
-                'description': 'This was a demanding workout that requires proper recovery.',
-                'actions': [
-                    'Stay hydrated and eat nutrient-rich foods',
-                    'Consider foam rolling or massage',
-                    'Get extra sleep tonight'
-                ]
-            })
+        if activity_type == 'strength_training':
+            recommendations.append('Allow 48 hours before working same muscle groups again')
         
         return recommendations
     
+    @staticmethod
+    def _generate_activity_recommendations(analysis: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Generate activity recommendations"""
+        
+        return [
+            {**recommendation, 'actions': list(recommendation['actions'])}
+            for section, field, triggers, recommendation in ACTIVITY_RECOMMENDATION_RULES
+            if analysis.get(section, {}).get(field) in triggers
+        ]
+    
     @staticmethod
     def analyze_activity_patterns(user, days: int = 30) -> Dict[str, Any]:
         """Analyze activity patterns over time"""
         
-        end_date = timezone.now().date()
+        end_date = timezone.localdate()
         start_date = end_date - timedelta(days=days)
         
         # Get activities in the period
@@ -450,28 +565,36 @@ class ActivityProcessor:
             start_time__date__range=[start_date, end_date]
         ).order_by('start_time')
         
-        if not activities.exists():
+        # Calculate statistics in one query
+        totals = activities.aggregate(
+            total_activities=Count('id'),
+            total_duration=Sum('duration_minutes'),
+            total_calories=Sum('calories_burned'),
+            total_steps=Sum('steps')
+        )
+        
+        total_activities = totals['total_activities']
+        if not total_activities:
             return {'status': 'no_data', 'message': f'No activity data for the last {days} days'}
         
-        # Calculate statistics
-        total_activities = activities.count()
-        total_duration = activities.aggregate(total=Sum('duration_minutes'))['total'] or 0
-        total_calories = activities.aggregate(total=Sum('calories_burned'))['total'] or 0
-        total_steps = activities.aggregate(total=Sum('steps'))['total'] or 0
+        total_duration = totals['total_duration'] or 0
+        total_calories = totals['total_calories'] or 0
+        total_steps = totals['total_steps'] or 0
         
         # Analyze by activity type
-        by_type = activities.values('activity_type').annotate(
+        by_type = list(activities.values('activity_type').annotate(
             count=Count('id'),
             total_duration=Sum('duration_minutes'),
             total_calories=Sum('calories_burned'),
             avg_duration=Avg('duration_minutes')
-        ).order_by('-count')
+        ).order_by('-count'))
         
-        # Analyze intensity distribution
-        intensity_distribution = activities.values('intensity').annotate(
+        # Analyze intensity distribution (clear the start_time ordering so it
+        # is not added to the GROUP BY)
+        intensity_distribution = list(activities.values('intensity').annotate(
             count=Count('id'),
             total_duration=Sum('duration_minutes')
-        )
+        ).order_by())
         
         # Calculate weekly patterns
         weekly_patterns = ActivityProcessor._analyze_weekly_patterns(activities)
@@ -496,8 +619,8 @@ class ActivityProcessor:
                 'average_daily_minutes': round(total_duration / days, 1),
                 'average_daily_calories': round(total_calories / days, 1)
             },
-            'by_activity_type': list(by_type),
-            'intensity_distribution': list(intensity_distribution),
+            'by_activity_type': by_type,
+            'intensity_distribution': intensity_distribution,
             'weekly_patterns': weekly_patterns,
             'progress_analysis': progress,
             'guideline_check': guideline_check,
@@ -510,65 +633,75 @@ class ActivityProcessor:
     def _analyze_weekly_patterns(activities) -> Dict[str, Any]:
         """Analyze activity patterns by day of week"""
         
-        patterns = {}
-        
-        # Group by day of week
-        for activity in activities:
-            weekday = activity.start_time.strftime('%A')
-            if weekday not in patterns:
-                patterns[weekday] = {
-                    'count': 0,
-                    'total_duration': 0,
-                    'total_calories': 0
-                }
-            
-            patterns[weekday]['count'] += 1
-            patterns[weekday]['total_duration'] += activity.duration_minutes
-            patterns[weekday]['total_calories'] += activity.calories_burned
+        import numpy as np
+        
+        # One narrow query; ISO weekday (1=Monday) is extracted by the database
+        rows = np.fromiter(
+            activities.order_by().values_list(
+                'start_time__iso_week_day', 'duration_minutes', 'calories_burned'
+            ),
+            dtype=[('w', 'i8'), ('d', 'f8'), ('c', 'f8')]
+        )
+        weekday = rows['w'] - 1
+        
+        counts = np.bincount(weekday, minlength=7)
+        durations = np.bincount(weekday, weights=rows['d'], minlength=7)
+        calories = np.bincount(weekday, weights=rows['c'], minlength=7)
+        
+        active = np.flatnonzero(counts)
+        patterns = {
+            WEEKDAY_NAMES[day]: {
+                'count': int(counts[day]),
+                'total_duration': int(durations[day]),
+                'total_calories': float(calories[day])
+            }
+            for day in active
+        }
         
         # Find most and least active days
-        if patterns:
-            most_active = max(patterns.items(), key=lambda x: x[1]['total_duration'])
-            least_active = min(patterns.items(), key=lambda x: x[1]['total_duration'])
+        if active.size:
+            most_active = active[np.argmax(durations[active])]
+            least_active = active[np.argmin(durations[active])]
+            most_active_day = {'day': WEEKDAY_NAMES[most_active], 'duration_minutes': int(durations[most_active])}
+            least_active_day = {'day': WEEKDAY_NAMES[least_active], 'duration_minutes': int(durations[least_active])}
         else:
-            most_active = least_active = (None, {})
+            most_active_day = {'day': None, 'duration_minutes': 0}
+            least_active_day = {'day': None, 'duration_minutes': 0}
         
         return {
             'daily_patterns': patterns,
-            'most_active_day': {
-                'day': most_active[0],
-                'duration_minutes': most_active[1].get('total_duration', 0)
-            },
-            'least_active_day': {
-                'day': least_active[0],
-                'duration_minutes': least_active[1].get('total_duration', 0)
-            }
+            'most_active_day': most_active_day,
+            'least_active_day': least_active_day
         }
     
     @staticmethod
     def _calculate_progress(activities, days: int) -> Dict[str, Any]:
         """Calculate progress over time"""
         
-        if len(activities) < 2:
+        import numpy as np
+        
+        # One ordered fetch of the two summed columns; the halves are array slices
+        data = np.fromiter(
+            activities.values_list('duration_minutes', 'calories_burned'),
+            dtype=[('duration', 'f8'), ('calories', 'f8')]
+        )
+        if len(data) < 2:
             return {'status': 'insufficient_data', 'message': 'Need more data to calculate progress'}
         
         # Split into two halves for comparison
-        midpoint = len(activities) // 2
-        first_half = activities[:midpoint]
-        second_half = activities[midpoint:]
+        midpoint = len(data) // 2
+        first_half = data[:midpoint]
+        second_half = data[midpoint:]
         
         # Calculate averages for each half
-        def calculate_averages(activity_list):
-            if not activity_list:
+        def calculate_averages(rows):
+            if not len(rows):
                 return {}
             
-            total_duration = sum(a.duration_minutes for a in activity_list)
-            total_calories = sum(a.calories_burned for a in activity_list)
-            
             return {
-                'avg_duration': total_duration / len(activity_list),
-                'avg_calories': total_calories / len(activity_list),
-                'frequency': len(activity_list) / (days / 2)  # Activities per day
+                'avg_duration': float(rows['duration'].mean()),
+                'avg_calories': float(rows['calories'].mean()),
+                'frequency': len(rows) / (days / 2)  # Activities per day
             }
         
         first_avg = calculate_averages(first_half)
@@ -595,10 +728,9 @@ class ActivityProcessor:
         # WHO guidelines: 150-300 minutes moderate or 75-150 minutes vigorous per week
         # Calculate weekly averages
         
-        total_moderate_minutes = sum(
-            a.duration_minutes for a in activities 
-            if a.intensity in ['moderate', 'vigorous', 'maximal']
-        )
+        total_moderate_minutes = activities.filter(
+            intensity__in=GUIDELINE_INTENSITIES
+        ).aggregate(total=Sum('duration_minutes'))['total'] or 0
         
         weekly_average = (total_moderate_minutes / days) * 7
         
@@ -658,4 +790,33 @@ class ActivityProcessor:
             recommendations.append("Consider adding strength training 2-3 times per week for muscle health.")
         
         return recommendations
-    
\ No newline at end of file
+    
+
+
+# Analyses of recently seen activities, oldest first. updated_at changes on
+# every save(), so edited activities miss the cache; QuerySet.update() does
+# not touch it, so clear _analysis_cache after bulk updates.
+_ANALYSIS_CACHE_SIZE = 1024
+_analysis_cache: 'OrderedDict[Tuple[Any, datetime], Dict[str, Any]]' = OrderedDict()
+_analysis_cache_lock = threading.Lock()
+
+
+def _cached_analysis(activity: Activity) -> Dict[str, Any]:
+    """Analysis for a saved activity, keyed on (id, updated_at)"""
+    
+    key = (activity.pk, activity.updated_at)
+    with _analysis_cache_lock:
+        analysis = _analysis_cache.get(key)
+        if analysis is not None:
+            _analysis_cache.move_to_end(key)
+    
+    if analysis is None:
+        analysis = ActivityProcessor._analyze_activity_uncached(activity)
+        with _analysis_cache_lock:
+            _analysis_cache[key] = analysis
+            if len(_analysis_cache) > _ANALYSIS_CACHE_SIZE:
+                _analysis_cache.popitem(last=False)
+    
+    # Only the key is kept, not the Activity; hand out copies so callers can't
+    # change the cached result
+    return copy.deepcopy(analysis)
@@ -1,9 +1,23 @@
 from django.contrib import admin
 from django.utils.html import format_html
+from django.utils.safestring import mark_safe
 from django.utils import timezone
-from django.db.models import Count, Avg, Sum, Q
+from django.db.models import (
+    Count, Avg, Sum, Q, F, Func, Case, When, Value, CharField, DurationField, ExpressionWrapper
+)
+from django.db.models.functions import Now
 from django.contrib.admin import SimpleListFilter
+from django.contrib.admin.views.main import ChangeList
+from django.core.paginator import Paginator
 import json
+import string
+from datetime import timedelta
+from types import MappingProxyType
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - previews fall back to the stdlib encoder
+    orjson = None
 
 from .models import (
     HeartRateReading, SleepSession, Activity, DailySummary,
@@ -11,6 +25,267 @@ from .models import (
 )
 
 
+# ============================================================
+# BADGES
+# ============================================================
+
+_BADGE_HTML = ('<span style="background-color: {}; color: white; '
+               'padding: 2px 6px; border-radius: 3px;">{}</span>')
+
+
+def _choice_badges(model, field_name, colors, default_color, transform=str):
+    """Pre-render the badge HTML for every choice of a field"""
+    return MappingProxyType({
+        value: format_html(_BADGE_HTML, colors.get(value, default_color), transform(label))
+        for value, label in model._meta.get_field(field_name).flatchoices
+    })
+
+
+def _choice_labels(model, field_name):
+    return MappingProxyType(dict(model._meta.get_field(field_name).flatchoices))
+
+
+def _badge(badges, value, default_color, transform=str):
+    badge = badges.get(value)
+    if badge is None:  # value outside the field's choices
+        badge = format_html(_BADGE_HTML, default_color, transform(value))
+    return badge
+
+
+def _number_badge(color, label):
+    # Colours come from this module and labels are formatted numbers, so skip escaping
+    return mark_safe(_BADGE_HTML.format(color, label))
+
+
+_PROGRESS_BAR_HTML = string.Template(
+    '<div style="width: ${outer}px; height: 20px; background-color: #e9ecef; '
+    'border-radius: 3px; overflow: hidden; position: relative;">'
+    '<div style="width: ${width}%; height: 100%; background-color: ${color};">'
+    '</div><span style="position: absolute; top: 0; left: 0; width: 100%; '
+    'text-align: center; line-height: 20px; font-size: 12px; color: #000;">'
+    '${label}</span></div>'
+)
+
+
+def _progress_bar(outer, width, color, label):
+    # Sizes and labels are formatted numbers and colours are literals from this
+    # module, so the markup is built without per-argument escaping.
+    return mark_safe(_PROGRESS_BAR_HTML.substitute(outer=outer, width=width, color=color, label=label))
+
+
+def _json_preview(data, limit):
+    """Indented JSON cut to `limit` characters, with '...' when anything was cut"""
+    if orjson is not None:
+        text = orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
+    else:
+        text = json.dumps(data, indent=2)
+    return text[:limit] + '...' if len(text) > limit else text
+
+
+_BPM_HTML = '<span style="color: {}; font-weight: bold;">{} bpm</span>'
+_ANOMALY_BADGE = format_html(_BADGE_HTML, '#dc3545', 'ANOMALY')
+_NORMAL_BADGE = format_html(_BADGE_HTML, '#28a745', 'Normal')
+_COMPLETE_BADGE = format_html(_BADGE_HTML, '#28a745', '✓ Complete')
+_INCOMPLETE_BADGE = format_html(_BADGE_HTML, '#6c757d', 'Incomplete')
+
+_GOAL_STATUS_BADGES = MappingProxyType({
+    'completed': format_html(_BADGE_HTML, '#28a745', '✓ Completed'),
+    'active': format_html(_BADGE_HTML, '#007bff', 'Active'),
+    'inactive': format_html(_BADGE_HTML, '#6c757d', 'Inactive'),
+})
+_ALERT_STATUS_BADGES = MappingProxyType({
+    'acknowledged': format_html(_BADGE_HTML, '#28a745', 'Acknowledged'),
+    'read': format_html(_BADGE_HTML, '#6c757d', 'Read'),
+    'unread': format_html(_BADGE_HTML, '#dc3545', 'Unread'),
+})
+_INSIGHT_STATUS_BADGES = MappingProxyType({
+    'applied': format_html(_BADGE_HTML, '#28a745', 'Applied'),
+    'dismissed': format_html(_BADGE_HTML, '#6c757d', 'Dismissed'),
+    'new': format_html(_BADGE_HTML, '#007bff', 'New'),
+    'pending': mark_safe('<span style="background-color: #ffc107; color: #000; '
+                         'padding: 2px 6px; border-radius: 3px;">Pending</span>'),
+})
+
+
+# Row colours chosen in SQL and read back as annotations by the admin columns
+_BPM_COLOR = Case(
+    When(bpm__gt=120, context='rest', then=Value('orange')),
+    When(Q(bpm__lt=50) & ~Q(context='sleep'), then=Value('red')),
+    default=Value('green'),
+    output_field=CharField()
+)
+
+
+def _score_color(field_name):
+    return Case(
+        When(**{f'{field_name}__gte': 85}, then=Value('#28a745')),  # green
+        When(**{f'{field_name}__gte': 70}, then=Value('#ffc107')),  # yellow
+        default=Value('#dc3545'),  # red
+        output_field=CharField()
+    )
+
+
+_SLEEP_EFFICIENCY_COLOR = Case(
+    When(sleep_efficiency__gte=85, then=Value('#28a745')),
+    default=Value('#ffc107'),
+    output_field=CharField()
+)
+
+_CONFIDENCE_COLOR = Case(
+    When(confidence__gte=0.9, then=Value('#28a745')),  # green
+    When(confidence__gte=0.7, then=Value('#ffc107')),  # yellow
+    default=Value('#dc3545'),  # red
+    output_field=CharField()
+)
+
+
+class DateLabel(Func):
+    """Format a date/datetime column in the database with a %b/%d/%Y/%H/%M strftime pattern"""
+    output_field = CharField()
+    
+    _TO_CHAR = {'%b': 'Mon', '%d': 'DD', '%Y': 'YYYY', '%H': 'HH24', '%M': 'MI'}
+    
+    def __init__(self, expression, fmt):
+        super().__init__(expression)
+        self.fmt = fmt
+    
+    def as_sql(self, compiler, connection, **extra_context):
+        # PostgreSQL to_char(); Django pins the session time zone to UTC like the stored values
+        pattern = self.fmt
+        for directive, field in self._TO_CHAR.items():
+            pattern = pattern.replace(directive, field)
+        sql, params = compiler.compile(self.source_expressions[0])
+        return f'to_char({sql}, %s)', (*params, pattern)
+    
+    def as_sqlite(self, compiler, connection, **extra_context):
+        # SQLite's strftime() has no month names, so %b is sliced out of a literal
+        sql, params = compiler.compile(self.source_expressions[0])
+        parts, part_params = [], []
+        for i, chunk in enumerate(self.fmt.split('%b')):
+            if i:
+                parts.append(f"substr('JanFebMarAprMayJunJulAugSepOctNovDec', "
+                             f"CAST(strftime(%s, {sql}) AS INTEGER) * 3 - 2, 3)")
+                part_params += ['%m', *params]
+            if chunk:
+                parts.append(f'strftime(%s, {sql})')
+                part_params += [chunk, *params]
+        return ' || '.join(parts), part_params
+
+
+_CONTEXT_COLORS = {
+    'rest': 'blue',
+    'active': 'green',
+    'workout': 'orange',
+    'sleep': 'purple',
+    'recovery': 'teal',
+    'unknown': 'gray'
+}
+_CONTEXT_BADGES = _choice_badges(HeartRateReading, 'context', _CONTEXT_COLORS, 'gray')
+
+_ACTIVITY_TYPE_COLORS = {
+    'running': '#dc3545',
+    'walking': '#28a745',
+    'cycling': '#007bff',
+    'swimming': '#17a2b8',
+    'yoga': '#6f42c1',
+    'strength_training': '#fd7e14',
+}
+_ACTIVITY_TYPE_BADGES = _choice_badges(Activity, 'activity_type', _ACTIVITY_TYPE_COLORS, '#6c757d')
+
+_INTENSITY_COLORS = {
+    'low': '#28a745',
+    'moderate': '#ffc107',
+    'vigorous': '#fd7e14',
+    'maximal': '#dc3545'
+}
+_INTENSITY_BADGES = _choice_badges(Activity, 'intensity', _INTENSITY_COLORS, '#6c757d')
+
+_GOAL_TYPE_COLORS = {
+    'steps': '#28a745',
+    'sleep': '#007bff',
+    'weight': '#6f42c1',
+    'activity': '#fd7e14',
+    'heart_rate': '#dc3545',
+}
+_GOAL_TYPE_BADGES = _choice_badges(HealthGoal, 'goal_type', _GOAL_TYPE_COLORS, '#6c757d')
+
+_SEVERITY_COLORS = {
+    'critical': '#dc3545',
+    'high': '#fd7e14',
+    'medium': '#ffc107',
+    'low': '#28a745',
+    'info': '#17a2b8'
+}
+_SEVERITY_BADGES = _choice_badges(HealthAlert, 'severity', _SEVERITY_COLORS, '#6c757d', str.upper)
+_ALERT_TYPE_LABELS = _choice_labels(HealthAlert, 'alert_type')
+
+# Map current severity to next level
+_SEVERITY_ESCALATION = MappingProxyType({
+    'info': 'low',
+    'low': 'medium',
+    'medium': 'high',
+    'high': 'critical'
+})
+_ESCALATED_SEVERITY = Case(
+    *[When(severity=old, then=Value(new)) for old, new in _SEVERITY_ESCALATION.items()],
+    output_field=CharField()
+)
+
+_CATEGORY_COLORS = {
+    'activity': '#28a745',
+    'sleep': '#007bff',
+    'heart': '#dc3545',
+    'nutrition': '#fd7e14',
+    'stress': '#6f42c1',
+    'recovery': '#17a2b8',
+    'overall': '#6c757d'
+}
+_CATEGORY_BADGES = _choice_badges(HealthInsight, 'category', _CATEGORY_COLORS, '#6c757d')
+_INSIGHT_TYPE_LABELS = _choice_labels(HealthInsight, 'insight_type')
+
+
+# ============================================================
+# CHANGELIST
+# ============================================================
+
+class DeferredChangeList(ChangeList):
+    """Changelist that leaves the admin's list_defer columns out of the SELECT"""
+    
+    def get_queryset(self, request, exclude_parameters=None):
+        qs = super().get_queryset(request, exclude_parameters)
+        return qs.defer(*self.model_admin.list_defer)
+
+
+class PrimaryKeyPaginator(Paginator):
+    """Paginator that walks the OFFSET over primary keys only, then loads just the page rows"""
+    
+    def page(self, number):
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        top = bottom + self.per_page
+        if top + self.orphans >= self.count:
+            top = self.count
+        pks = list(self.object_list.values_list('pk', flat=True)[bottom:top])
+        return self._get_page(self.object_list.filter(pk__in=pks), number, self)
+
+
+class UserEmailMixin:
+    """Owner column shared by every per-user health admin"""
+    
+    def user_email(self, obj):
+        return obj.user.email
+    user_email.short_description = 'User'
+    user_email.admin_order_field = 'user__email'
+
+
+class ListDeferMixin:
+    """Defer wide text/JSON columns on the changelist only; change forms load full rows"""
+    list_defer = ()
+    
+    def get_changelist(self, request, **kwargs):
+        return DeferredChangeList
+
+
 # ============================================================
 # CUSTOM FILTERS
 # ============================================================
@@ -19,6 +294,14 @@ class DateRangeFilter(SimpleListFilter):
     title = 'Date Range'
     parameter_name = 'date_range'
 
+    # value -> filter kwargs for today's date
+    ranges = {
+        'today': lambda today: {'created_at__date': today},
+        'yesterday': lambda today: {'created_at__date': today - timedelta(days=1)},
+        'last_7_days': lambda today: {'created_at__date__gte': today - timedelta(days=7)},
+        'this_month': lambda today: {'created_at__month': today.month, 'created_at__year': today.year},
+    }
+
     def lookups(self, request, model_admin):
         return [
             ('today', 'Today'),
@@ -28,23 +311,24 @@ class DateRangeFilter(SimpleListFilter):
         ]
 
     def queryset(self, request, queryset):
-        today = timezone.now().date()
+        date_range = self.ranges.get(self.value())
+        if date_range is None:
+            return queryset
         
-        if self.value() == 'today':
-            return queryset.filter(created_at__date=today)
-        elif self.value() == 'yesterday':
-            yesterday = today - timezone.timedelta(days=1)
-            return queryset.filter(created_at__date=yesterday)
-        elif self.value() == 'last_7_days':
-            return queryset.filter(created_at__date__gte=today - timezone.timedelta(days=7))
-        elif self.value() == 'this_month':
-            return queryset.filter(created_at__month=today.month, created_at__year=today.year)
+        return queryset.filter(**date_range(timezone.localdate()))
 
 
 class HealthScoreFilter(SimpleListFilter):
     title = 'Health Score'
     parameter_name = 'health_score'
 
+    buckets = {
+        'excellent': Q(overall_score__gte=85),
+        'good': Q(overall_score__gte=70, overall_score__lt=85),
+        'fair': Q(overall_score__gte=50, overall_score__lt=70),
+        'poor': Q(overall_score__lt=50),
+    }
+
     def lookups(self, request, model_admin):
         return [
             ('excellent', 'Excellent (≥85)'),
@@ -54,25 +338,27 @@ class HealthScoreFilter(SimpleListFilter):
         ]
 
     def queryset(self, request, queryset):
-        if self.value() == 'excellent':
-            return queryset.filter(overall_score__gte=85)
-        elif self.value() == 'good':
-            return queryset.filter(overall_score__gte=70, overall_score__lt=85)
-        elif self.value() == 'fair':
-            return queryset.filter(overall_score__gte=50, overall_score__lt=70)
-        elif self.value() == 'poor':
-            return queryset.filter(overall_score__lt=50)
+        bucket = self.buckets.get(self.value())
+        if bucket is None:
+            return queryset
+        
+        return queryset.filter(bucket)
 
 # ============================================================
 # ADMIN CLASSES
 # ============================================================
 
 @admin.register(HeartRateReading)
-class HeartRateReadingAdmin(admin.ModelAdmin):
+class HeartRateReadingAdmin(UserEmailMixin, ListDeferMixin, admin.ModelAdmin):
     list_display = ('user_email', 'bpm_display', 'timestamp_short', 'context_badge', 
                     'is_anomaly_badge', 'created_at_short')
+    list_select_related = ('user',)
+    list_defer = ('raw_data',)
+    show_full_result_count = False
+    paginator = PrimaryKeyPaginator
     list_filter = ('context', DateRangeFilter, 'user', 'is_anomaly')
-    search_fields = ('user__email', 'context', 'anomaly_type')
+    search_fields = ('^user__email', '=context', '=anomaly_type')
+    search_help_text = 'User email (starts with), or an exact context or anomaly type'
     readonly_fields = ('created_at', 'updated_at', 'bpm_display', 'data_hash')
     list_per_page = 50
     date_hierarchy = 'timestamp'
@@ -90,63 +376,45 @@ class HeartRateReadingAdmin(admin.ModelAdmin):
         }),
     )
     
-    def user_email(self, obj):
-        return obj.user.email
-    user_email.short_description = 'User'
-    user_email.admin_order_field = 'user__email'
-    
     def bpm_display(self, obj):
-        color = 'green'
-        if obj.is_elevated:
-            color = 'orange'
-        elif obj.is_low:
-            color = 'red'
-        return format_html('<span style="color: {}; font-weight: bold;">{} bpm</span>', 
-                          color, obj.bpm)
+        return mark_safe(_BPM_HTML.format(obj.bpm_color, obj.bpm))
     bpm_display.short_description = 'BPM'
     
     def timestamp_short(self, obj):
-        return obj.timestamp.strftime('%b %d, %H:%M')
+        return obj.timestamp_label
     timestamp_short.short_description = 'Time'
     timestamp_short.admin_order_field = 'timestamp'
     
     def context_badge(self, obj):
-        colors = {
-            'rest': 'blue',
-            'active': 'green',
-            'workout': 'orange',
-            'sleep': 'purple',
-            'recovery': 'teal',
-            'unknown': 'gray'
-        }
-        color = colors.get(obj.context, 'gray')
-        return format_html('<span style="background-color: {}; color: white; '
-                          'padding: 2px 6px; border-radius: 3px;">{}</span>',
-                          color, obj.get_context_display())
+        return _badge(_CONTEXT_BADGES, obj.context, 'gray')
     context_badge.short_description = 'Context'
     
     def is_anomaly_badge(self, obj):
-        if obj.is_anomaly:
-            return format_html('<span style="background-color: #dc3545; color: white; '
-                              'padding: 2px 6px; border-radius: 3px;">ANOMALY</span>')
-        return format_html('<span style="background-color: #28a745; color: white; '
-                          'padding: 2px 6px; border-radius: 3px;">Normal</span>')
+        return _ANOMALY_BADGE if obj.is_anomaly else _NORMAL_BADGE
     is_anomaly_badge.short_description = 'Status'
     
     def created_at_short(self, obj):
-        return obj.created_at.strftime('%b %d')
+        return obj.created_at_label
     created_at_short.short_description = 'Recorded'
     
     def get_queryset(self, request):
-        return super().get_queryset(request).select_related('user', 'device')
+        return super().get_queryset(request).annotate(
+            bpm_color=_BPM_COLOR,
+            timestamp_label=DateLabel('timestamp', '%b %d, %H:%M'),
+            created_at_label=DateLabel('created_at', '%b %d')
+        )
 
 
 @admin.register(SleepSession)
-class SleepSessionAdmin(admin.ModelAdmin):
+class SleepSessionAdmin(UserEmailMixin, ListDeferMixin, admin.ModelAdmin):
     list_display = ('user_email', 'date_display', 'duration_display', 
                     'quality_score_progress', 'sleep_efficiency_badge', 'created_at_short')
+    list_select_related = ('user',)
+    list_defer = ('raw_data', 'notes')
+    show_full_result_count = False
     list_filter = ('quality_category', DateRangeFilter, 'user')
-    search_fields = ('user__email', 'notes')
+    search_fields = ('^user__email',)
+    search_help_text = 'User email (starts with)'
     readonly_fields = ('created_at', 'updated_at', 'duration_display', 
                       'sleep_stages_summary', 'total_sleep_display')
     list_per_page = 30
@@ -176,13 +444,8 @@ class SleepSessionAdmin(admin.ModelAdmin):
         }),
     )
     
-    def user_email(self, obj):
-        return obj.user.email
-    user_email.short_description = 'User'
-    user_email.admin_order_field = 'user__email'
-    
     def date_display(self, obj):
-        return obj.start_time.strftime('%b %d, %Y')
+        return obj.start_time_label
     date_display.short_description = 'Date'
     date_display.admin_order_field = 'start_time'
     
@@ -209,47 +472,39 @@ class SleepSessionAdmin(admin.ModelAdmin):
     def quality_score_progress(self, obj):
         if obj.quality_score:
             width = min(obj.quality_score, 100)
-            color = '#dc3545'  # red
-            if obj.quality_score >= 85:
-                color = '#28a745'  # green
-            elif obj.quality_score >= 70:
-                color = '#ffc107'  # yellow
-            
-            return format_html(
-                '<div style="width: 100px; height: 20px; background-color: #e9ecef; '
-                'border-radius: 3px; overflow: hidden; position: relative;">'
-                '<div style="width: {}%; height: 100%; background-color: {};">'
-                '</div><span style="position: absolute; top: 0; left: 0; width: 100%; '
-                'text-align: center; line-height: 20px; font-size: 12px; color: #000;">'
-                '{:.0f}</span></div>',
-                width, color, obj.quality_score
-            )
+            return _progress_bar(100, width, obj.quality_score_color, f'{obj.quality_score:.0f}')
         return "N/A"
     quality_score_progress.short_description = 'Quality Score'
     
     def sleep_efficiency_badge(self, obj):
         if obj.sleep_efficiency:
-            color = '#28a745' if obj.sleep_efficiency >= 85 else '#ffc107'
-            return format_html('<span style="background-color: {}; color: white; '
-                              'padding: 2px 6px; border-radius: 3px;">{:.1f}%</span>',
-                              color, obj.sleep_efficiency)
+            return _number_badge(obj.sleep_efficiency_color, f'{obj.sleep_efficiency:.1f}%')
         return "N/A"
     sleep_efficiency_badge.short_description = 'Efficiency'
     
     def created_at_short(self, obj):
-        return obj.created_at.strftime('%b %d')
+        return obj.created_at_label
     created_at_short.short_description = 'Recorded'
     
     def get_queryset(self, request):
-        return super().get_queryset(request).select_related('user', 'device')
+        return super().get_queryset(request).annotate(
+            quality_score_color=_score_color('quality_score'),
+            sleep_efficiency_color=_SLEEP_EFFICIENCY_COLOR,
+            start_time_label=DateLabel('start_time', '%b %d, %Y'),
+            created_at_label=DateLabel('created_at', '%b %d')
+        )
 
 
 @admin.register(Activity)
-class ActivityAdmin(admin.ModelAdmin):
+class ActivityAdmin(UserEmailMixin, ListDeferMixin, admin.ModelAdmin):
     list_display = ('user_email', 'activity_type_badge', 'date_display', 
                     'duration_display', 'calories_display', 'intensity_badge')
+    list_select_related = ('user',)
+    list_defer = ('raw_data', 'gps_coordinates', 'heart_rate_zones', 'notes')
+    show_full_result_count = False
     list_filter = ('activity_type', 'intensity', DateRangeFilter, 'user')
-    search_fields = ('user__email', 'activity_type', 'notes')
+    search_fields = ('^user__email', '=activity_type')
+    search_help_text = 'User email (starts with), or an exact activity type'
     readonly_fields = ('created_at', 'updated_at', 'duration_display', 
                       'calories_per_minute_display', 'pace_display')
     list_per_page = 30
@@ -277,28 +532,12 @@ class ActivityAdmin(admin.ModelAdmin):
         }),
     )
     
-    def user_email(self, obj):
-        return obj.user.email
-    user_email.short_description = 'User'
-    user_email.admin_order_field = 'user__email'
-    
     def activity_type_badge(self, obj):
-        colors = {
-            'running': '#dc3545',
-            'walking': '#28a745',
-            'cycling': '#007bff',
-            'swimming': '#17a2b8',
-            'yoga': '#6f42c1',
-            'strength_training': '#fd7e14',
-        }
-        color = colors.get(obj.activity_type, '#6c757d')
-        return format_html('<span style="background-color: {}; color: white; '
-                          'padding: 2px 6px; border-radius: 3px;">{}</span>',
-                          color, obj.get_activity_type_display())
+        return _badge(_ACTIVITY_TYPE_BADGES, obj.activity_type, '#6c757d')
     activity_type_badge.short_description = 'Activity'
     
     def date_display(self, obj):
-        return obj.start_time.strftime('%b %d')
+        return obj.start_time_label
     date_display.short_description = 'Date'
     date_display.admin_order_field = 'start_time'
     
@@ -323,29 +562,24 @@ class ActivityAdmin(admin.ModelAdmin):
     pace_display.short_description = 'Average Pace'
     
     def intensity_badge(self, obj):
-        colors = {
-            'low': '#28a745',
-            'moderate': '#ffc107',
-            'vigorous': '#fd7e14',
-            'maximal': '#dc3545'
-        }
-        color = colors.get(obj.intensity, '#6c757d')
-        return format_html('<span style="background-color: {}; color: white; '
-                          'padding: 2px 6px; border-radius: 3px;">{}</span>',
-                          color, obj.get_intensity_display())
+        return _badge(_INTENSITY_BADGES, obj.intensity, '#6c757d')
     intensity_badge.short_description = 'Intensity'
     
     def get_queryset(self, request):
-        return super().get_queryset(request).select_related('user', 'device')
+        return super().get_queryset(request).annotate(start_time_label=DateLabel('start_time', '%b %d'))
 
 
 @admin.register(DailySummary)
-class DailySummaryAdmin(admin.ModelAdmin):
+class DailySummaryAdmin(UserEmailMixin, ListDeferMixin, admin.ModelAdmin):
     list_display = ('user_email', 'date_display', 'steps_progress', 
                     'calories_display', 'sleep_display', 'overall_score_progress', 
                     'complete_badge')
+    list_select_related = ('user',)
+    list_defer = ('insights', 'recommendations', 'data_sources', 'menstrual_symptoms')
+    show_full_result_count = False
     list_filter = (HealthScoreFilter, DateRangeFilter, 'is_complete', 'user')
-    search_fields = ('user__email',)
+    search_fields = ('^user__email',)
+    search_help_text = 'User email (starts with)'
     readonly_fields = ('created_at', 'updated_at', 'health_metrics_summary',
                       'activity_summary', 'sleep_summary')
     list_per_page = 20
@@ -377,28 +611,15 @@ class DailySummaryAdmin(admin.ModelAdmin):
         }),
     )
     
-    def user_email(self, obj):
-        return obj.user.email
-    user_email.short_description = 'User'
-    user_email.admin_order_field = 'user__email'
-    
     def date_display(self, obj):
-        return obj.date.strftime('%b %d, %Y')
+        return obj.date_label
     date_display.short_description = 'Date'
     date_display.admin_order_field = 'date'
     
     def steps_progress(self, obj):
         width = min(obj.total_steps / 100, 100)  # Assuming 10000 steps as 100%
         color = '#28a745' if obj.total_steps >= 8000 else '#ffc107'
-        return format_html(
-            '<div style="width: 80px; height: 20px; background-color: #e9ecef; '
-            'border-radius: 3px; overflow: hidden; position: relative;">'
-            '<div style="width: {}%; height: 100%; background-color: {};">'
-            '</div><span style="position: absolute; top: 0; left: 0; width: 100%; '
-            'text-align: center; line-height: 20px; font-size: 12px; color: #000;">'
-            '{:,}</span></div>',
-            width, color, obj.total_steps
-        )
+        return _progress_bar(80, width, color, f'{obj.total_steps:,}')
     steps_progress.short_description = 'Steps'
     
     def calories_display(self, obj):
@@ -416,30 +637,12 @@ class DailySummaryAdmin(admin.ModelAdmin):
     def overall_score_progress(self, obj):
         if obj.overall_score:
             width = min(obj.overall_score, 100)
-            color = '#dc3545'  # red
-            if obj.overall_score >= 85:
-                color = '#28a745'  # green
-            elif obj.overall_score >= 70:
-                color = '#ffc107'  # yellow
-            
-            return format_html(
-                '<div style="width: 80px; height: 20px; background-color: #e9ecef; '
-                'border-radius: 3px; overflow: hidden; position: relative;">'
-                '<div style="width: {}%; height: 100%; background-color: {};">'
-                '</div><span style="position: absolute; top: 0; left: 0; width: 100%; '
-                'text-align: center; line-height: 20px; font-size: 12px; color: #000;">'
-                '{:.0f}</span></div>',
-                width, color, obj.overall_score
-            )
+            return _progress_bar(80, width, obj.overall_score_color, f'{obj.overall_score:.0f}')
         return "N/A"
     overall_score_progress.short_description = 'Score'
     
     def complete_badge(self, obj):
-        if obj.is_complete:
-            return format_html('<span style="background-color: #28a745; color: white; '
-                              'padding: 2px 6px; border-radius: 3px;">✓ Complete</span>')
-        return format_html('<span style="background-color: #6c757d; color: white; '
-                          'padding: 2px 6px; border-radius: 3px;">Incomplete</span>')
+        return _COMPLETE_BADGE if obj.is_complete else _INCOMPLETE_BADGE
     complete_badge.short_description = 'Status'
     
     def health_metrics_summary(self, obj):
@@ -468,15 +671,21 @@ class DailySummaryAdmin(admin.ModelAdmin):
     sleep_summary.short_description = 'Sleep'
     
     def get_queryset(self, request):
-        return super().get_queryset(request).select_related('user')
+        return super().get_queryset(request).annotate(
+            overall_score_color=_score_color('overall_score'),
+            date_label=DateLabel('date', '%b %d, %Y')
+        )
 
 
 @admin.register(HealthGoal)
-class HealthGoalAdmin(admin.ModelAdmin):
+class HealthGoalAdmin(UserEmailMixin, ListDeferMixin, admin.ModelAdmin):
     list_display = ('user_email', 'name_short', 'goal_type_badge', 'progress_bar', 
                     'target_display', 'status_badge')
+    list_select_related = ('user',)
+    list_defer = ('description',)
     list_filter = ('goal_type', 'frequency', 'is_active', 'is_completed', 'user')
-    search_fields = ('user__email', 'name', 'description')
+    search_fields = ('^user__email', 'name')
+    search_help_text = 'User email (starts with) or goal name'
     readonly_fields = ('created_at', 'updated_at', 'progress_bar_display', 
                       'days_remaining_display', 'streak_display')
     list_per_page = 30
@@ -502,46 +711,20 @@ class HealthGoalAdmin(admin.ModelAdmin):
     
     actions = ['mark_completed', 'mark_incomplete', 'activate_goals', 'deactivate_goals']
     
-    def user_email(self, obj):
-        return obj.user.email
-    user_email.short_description = 'User'
-    user_email.admin_order_field = 'user__email'
-    
     def name_short(self, obj):
         return obj.name[:50] + '...' if len(obj.name) > 50 else obj.name
     name_short.short_description = 'Name'
     
     def goal_type_badge(self, obj):
-        colors = {
-            'steps': '#28a745',
-            'sleep': '#007bff',
-            'weight': '#6f42c1',
-            'activity': '#fd7e14',
-            'heart_rate': '#dc3545',
-        }
-        color = colors.get(obj.goal_type, '#6c757d')
-        return format_html('<span style="background-color: {}; color: white; '
-                          'padding: 2px 6px; border-radius: 3px;">{}</span>',
-                          color, obj.get_goal_type_display())
+        return _badge(_GOAL_TYPE_BADGES, obj.goal_type, '#6c757d')
     goal_type_badge.short_description = 'Type'
     
     def progress_bar(self, obj):
         width = min(obj.progress_percentage, 100)
         color = '#28a745' if obj.progress_percentage >= 100 else '#007bff'
-        return format_html(
-            '<div style="width: 100px; height: 20px; background-color: #e9ecef; '
-            'border-radius: 3px; overflow: hidden; position: relative;">'
-            '<div style="width: {}%; height: 100%; background-color: {};">'
-            '</div><span style="position: absolute; top: 0; left: 0; width: 100%; '
-            'text-align: center; line-height: 20px; font-size: 12px; color: #000;">'
-            '{:.1f}%</span></div>',
-            width, color, obj.progress_percentage
-        )
+        return _progress_bar(100, width, color, f'{obj.progress_percentage:.1f}%')
     progress_bar.short_description = 'Progress'
-    
-    def progress_bar_display(self, obj):
-        return self.progress_bar(obj)
-    progress_bar_display.short_description = 'Progress'
+    progress_bar_display = progress_bar
     
     def target_display(self, obj):
         return f"{obj.current_value:.1f}/{obj.target_value:.1f} {obj.unit}"
@@ -549,19 +732,15 @@ class HealthGoalAdmin(admin.ModelAdmin):
     
     def status_badge(self, obj):
         if obj.is_completed:
-            return format_html('<span style="background-color: #28a745; color: white; '
-                              'padding: 2px 6px; border-radius: 3px;">✓ Completed</span>')
+            return _GOAL_STATUS_BADGES['completed']
         elif obj.is_active:
-            return format_html('<span style="background-color: #007bff; color: white; '
-                              'padding: 2px 6px; border-radius: 3px;">Active</span>')
-        return format_html('<span style="background-color: #6c757d; color: white; '
-                          'padding: 2px 6px; border-radius: 3px;">Inactive</span>')
+            return _GOAL_STATUS_BADGES['active']
+        return _GOAL_STATUS_BADGES['inactive']
     status_badge.short_description = 'Status'
     
     def days_remaining_display(self, obj):
         if obj.end_date:
-            today = timezone.now().date()
-            days = (obj.end_date - today).days
+            days = (obj.end_date - timezone.localdate()).days
             color = '#dc3545' if days < 7 else '#ffc107' if days < 30 else '#28a745'
             return format_html('<span style="color: {}; font-weight: bold;">{} days</span>',
                               color, max(days, 0))
@@ -573,7 +752,7 @@ class HealthGoalAdmin(admin.ModelAdmin):
     streak_display.short_description = 'Streaks'
     
     def mark_completed(self, request, queryset):
-        updated = queryset.update(is_completed=True, completed_at=timezone.now())
+        updated = queryset.update(is_completed=True, completed_at=Now())
         self.message_user(request, f'{updated} goals marked as completed.')
     mark_completed.short_description = "Mark selected as completed"
     
@@ -591,18 +770,20 @@ class HealthGoalAdmin(admin.ModelAdmin):
         updated = queryset.update(is_active=False)
         self.message_user(request, f'{updated} goals deactivated.')
     deactivate_goals.short_description = "Deactivate selected goals"
-    
-    def get_queryset(self, request):
-        return super().get_queryset(request).select_related('user')
 
 
 @admin.register(HealthAlert)
-class HealthAlertAdmin(admin.ModelAdmin):
+class HealthAlertAdmin(UserEmailMixin, ListDeferMixin, admin.ModelAdmin):
     list_display = ('user_email', 'severity_badge', 'alert_type_display', 
                     'title_short', 'status_badge', 'time_since')
+    list_select_related = ('user',)
+    list_defer = ('message',)
+    show_full_result_count = False
+    paginator = PrimaryKeyPaginator
     list_filter = ('alert_type', 'severity', 'is_read', 'is_acknowledged', 
                    DateRangeFilter, 'user')
-    search_fields = ('user__email', 'title', 'message')
+    search_fields = ('^user__email', 'title')
+    search_help_text = 'User email (starts with) or alert title'
     readonly_fields = ('created_at', 'read_at', 'acknowledged_at', 
                       'time_since_display', 'details_summary')
     list_per_page = 50
@@ -627,27 +808,12 @@ class HealthAlertAdmin(admin.ModelAdmin):
     actions = ['mark_as_read', 'mark_as_unread', 'acknowledge_alerts', 
                'escalate_severity', 'dismiss_alerts']
     
-    def user_email(self, obj):
-        return obj.user.email
-    user_email.short_description = 'User'
-    user_email.admin_order_field = 'user__email'
-    
     def severity_badge(self, obj):
-        colors = {
-            'critical': '#dc3545',
-            'high': '#fd7e14',
-            'medium': '#ffc107',
-            'low': '#28a745',
-            'info': '#17a2b8'
-        }
-        color = colors.get(obj.severity, '#6c757d')
-        return format_html('<span style="background-color: {}; color: white; '
-                          'padding: 2px 6px; border-radius: 3px;">{}</span>',
-                          color, obj.get_severity_display().upper())
+        return _badge(_SEVERITY_BADGES, obj.severity, '#6c757d', str.upper)
     severity_badge.short_description = 'Severity'
     
     def alert_type_display(self, obj):
-        return obj.get_alert_type_display()
+        return _ALERT_TYPE_LABELS.get(obj.alert_type, obj.alert_type)
     alert_type_display.short_description = 'Type'
     
     def title_short(self, obj):
@@ -656,17 +822,16 @@ class HealthAlertAdmin(admin.ModelAdmin):
     
     def status_badge(self, obj):
         if obj.is_acknowledged:
-            return format_html('<span style="background-color: #28a745; color: white; '
-                              'padding: 2px 6px; border-radius: 3px;">Acknowledged</span>')
+            return _ALERT_STATUS_BADGES['acknowledged']
         elif obj.is_read:
-            return format_html('<span style="background-color: #6c757d; color: white; '
-                              'padding: 2px 6px; border-radius: 3px;">Read</span>')
-        return format_html('<span style="background-color: #dc3545; color: white; '
-                          'padding: 2px 6px; border-radius: 3px;">Unread</span>')
+            return _ALERT_STATUS_BADGES['read']
+        return _ALERT_STATUS_BADGES['unread']
     status_badge.short_description = 'Status'
     
     def time_since(self, obj):
-        delta = timezone.now() - obj.triggered_at
+        delta = getattr(obj, 'triggered_ago', None)
+        if delta is None:
+            delta = timezone.now() - obj.triggered_at
         if delta.days > 0:
             return f"{delta.days}d ago"
         elif delta.seconds > 3600:
@@ -691,41 +856,38 @@ class HealthAlertAdmin(admin.ModelAdmin):
     details_summary.short_description = 'Alert Details'
     
     def escalate_severity(self, request, queryset):
-        # Map current severity to next level
-        severity_map = {
-            'info': 'low',
-            'low': 'medium',
-            'medium': 'high',
-            'high': 'critical'
-        }
-        
-        updated = 0
-        for alert in queryset:
-            if alert.severity in severity_map:
-                alert.severity = severity_map[alert.severity]
-                alert.save()
-                updated += 1
+        updated = queryset.filter(severity__in=list(_SEVERITY_ESCALATION)).update(
+            severity=_ESCALATED_SEVERITY
+        )
         
         self.message_user(request, f'{updated} alerts escalated.')
     escalate_severity.short_description = "Escalate severity"
     
     def dismiss_alerts(self, request, queryset):
         updated = queryset.update(is_read=True, is_acknowledged=True, 
-                                 read_at=timezone.now(), acknowledged_at=timezone.now())
+                                 read_at=Now(), acknowledged_at=Now())
         self.message_user(request, f'{updated} alerts dismissed.')
     dismiss_alerts.short_description = "Dismiss alerts"
     
     def get_queryset(self, request):
-        return super().get_queryset(request).select_related('user')
+        return super().get_queryset(request).annotate(
+            triggered_ago=ExpressionWrapper(Now() - F('triggered_at'), output_field=DurationField())
+        )
 
 
 @admin.register(HealthInsight)
-class HealthInsightAdmin(admin.ModelAdmin):
+class HealthInsightAdmin(UserEmailMixin, ListDeferMixin, admin.ModelAdmin):
     list_display = ('user_email', 'category_badge', 'insight_type_display', 
                     'title_short', 'confidence_badge', 'status_badge', 'age_display')
+    list_select_related = ('user',)
+    list_defer = ('description', 'data_points', 'visualization_data', 
+                  'action_items', 'recommendations')
+    show_full_result_count = False
+    paginator = PrimaryKeyPaginator
     list_filter = ('insight_type', 'category', 'is_new', 'is_applied', 
                    'is_dismissed', 'generated_by', DateRangeFilter, 'user')
-    search_fields = ('user__email', 'title', 'description')
+    search_fields = ('^user__email', 'title')
+    search_help_text = 'User email (starts with) or insight title'
     readonly_fields = ('created_at', 'updated_at', 'data_preview', 
                       'visualization_preview', 'age_details')
     list_per_page = 30
@@ -756,29 +918,12 @@ class HealthInsightAdmin(admin.ModelAdmin):
     actions = ['mark_as_read', 'mark_as_unread', 'apply_insights', 
                'dismiss_insights', 'regenerate_insights']
     
-    def user_email(self, obj):
-        return obj.user.email
-    user_email.short_description = 'User'
-    user_email.admin_order_field = 'user__email'
-    
     def category_badge(self, obj):
-        colors = {
-            'activity': '#28a745',
-            'sleep': '#007bff',
-            'heart': '#dc3545',
-            'nutrition': '#fd7e14',
-            'stress': '#6f42c1',
-            'recovery': '#17a2b8',
-            'overall': '#6c757d'
-        }
-        color = colors.get(obj.category, '#6c757d')
-        return format_html('<span style="background-color: {}; color: white; '
-                          'padding: 2px 6px; border-radius: 3px;">{}</span>',
-                          color, obj.get_category_display())
+        return _badge(_CATEGORY_BADGES, obj.category, '#6c757d')
     category_badge.short_description = 'Category'
     
     def insight_type_display(self, obj):
-        return obj.get_insight_type_display()
+        return _INSIGHT_TYPE_LABELS.get(obj.insight_type, obj.insight_type)
     insight_type_display.short_description = 'Type'
     
     def title_short(self, obj):
@@ -786,29 +931,17 @@ class HealthInsightAdmin(admin.ModelAdmin):
     title_short.short_description = 'Title'
     
     def confidence_badge(self, obj):
-        color = '#dc3545'  # red
-        if obj.confidence >= 0.9:
-            color = '#28a745'  # green
-        elif obj.confidence >= 0.7:
-            color = '#ffc107'  # yellow
-        
-        return format_html('<span style="background-color: {}; color: white; '
-                          'padding: 2px 6px; border-radius: 3px;">{:.0%}</span>',
-                          color, obj.confidence)
+        return _number_badge(obj.confidence_color, f'{obj.confidence:.0%}')
     confidence_badge.short_description = 'Confidence'
     
     def status_badge(self, obj):
         if obj.is_applied:
-            return format_html('<span style="background-color: #28a745; color: white; '
-                              'padding: 2px 6px; border-radius: 3px;">Applied</span>')
+            return _INSIGHT_STATUS_BADGES['applied']
         elif obj.is_dismissed:
-            return format_html('<span style="background-color: #6c757d; color: white; '
-                              'padding: 2px 6px; border-radius: 3px;">Dismissed</span>')
+            return _INSIGHT_STATUS_BADGES['dismissed']
         elif obj.is_new:
-            return format_html('<span style="background-color: #007bff; color: white; '
-                              'padding: 2px 6px; border-radius: 3px;">New</span>')
-        return format_html('<span style="background-color: #ffc107; color: #000; '
-                          'padding: 2px 6px; border-radius: 3px;">Pending</span>')
+            return _INSIGHT_STATUS_BADGES['new']
+        return _INSIGHT_STATUS_BADGES['pending']
     status_badge.short_description = 'Status'
     
     def age_display(self, obj):
@@ -818,9 +951,7 @@ class HealthInsightAdmin(admin.ModelAdmin):
     def data_preview(self, obj):
         if obj.data_points:
             # Truncate for display
-            preview = json.dumps(obj.data_points, indent=2)[:500]
-            if len(json.dumps(obj.data_points)) > 500:
-                preview += "..."
+            preview = _json_preview(obj.data_points, 500)
             return format_html('<pre style="max-height: 200px; overflow: auto; '
                               'background-color: #f8f9fa; padding: 10px; '
                               'border-radius: 3px;">{}</pre>', preview)
@@ -829,9 +960,7 @@ class HealthInsightAdmin(admin.ModelAdmin):
     
     def visualization_preview(self, obj):
         if obj.visualization_data:
-            preview = json.dumps(obj.visualization_data, indent=2)[:300]
-            if len(json.dumps(obj.visualization_data)) > 300:
-                preview += "..."
+            preview = _json_preview(obj.visualization_data, 300)
             return format_html('<pre style="max-height: 150px; overflow: auto; '
                               'background-color: #f8f9fa; padding: 10px; '
                               'border-radius: 3px; font-size: 12px;">{}</pre>', preview)
@@ -845,12 +974,12 @@ class HealthInsightAdmin(admin.ModelAdmin):
     def regenerate_insights(self, request, queryset):
         # In a real application, this would call your insight generation service
         # For now, just mark as new to simulate regeneration
-        updated = queryset.update(is_new=True, generated_at=timezone.now())
+        updated = queryset.update(is_new=True, generated_at=Now())
         self.message_user(request, f'{updated} insights marked for regeneration.')
     regenerate_insights.short_description = "Regenerate insights"
     
     def get_queryset(self, request):
-        return super().get_queryset(request).select_related('user')
+        return super().get_queryset(request).annotate(confidence_color=_CONFIDENCE_COLOR)
 
 
 # ============================================================
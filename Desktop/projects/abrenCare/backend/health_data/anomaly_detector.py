@@ -1,8 +1,14 @@
 import numpy as np
+import pandas as pd
 import logging
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone as dt_timezone
 from typing import List, Dict, Any, Optional, Tuple
+from django.core.cache import cache
+from django.db import connection, connections
+from django.db.models.functions import ExtractHour, ExtractIsoWeekDay, Now
 from django.utils import timezone
+from numpy.lib.stride_tricks import sliding_window_view
 from sklearn.ensemble import IsolationForest
 from sklearn.preprocessing import StandardScaler
 
@@ -10,6 +16,34 @@ from .models import HeartRateReading, SleepSession, Activity
 
 logger = logging.getLogger(__name__)
 
+# Fitted models are reused per user and detector until they expire or the
+# number of samples grows past the refit factor
+_MODEL_CACHE_TIMEOUT = 60 * 60
+_MODEL_REFIT_GROWTH = 1.2
+
+_CONTEXT_CODES = {
+    'rest': 0,
+    'active': 1,
+    'workout': 2,
+    'recovery': 3,
+    'sleep': 4,
+    'unknown': 5
+}
+_UNKNOWN_CONTEXT_CODE = 5
+
+_ACTIVITY_FEATURES = [
+    'duration_minutes', 'calories_burned', 'distance_km', 'steps',
+    'avg_heart_rate', 'weekday'
+]
+
+
+def _run_detector(detect, **kwargs):
+    """Run a detector on a pool thread, closing the connections it opened there"""
+    try:
+        return detect(**kwargs)
+    finally:
+        connections.close_all()
+
 
 class AnomalyDetector:
     """Detect anomalies in health data using machine learning"""
@@ -31,11 +65,15 @@ class AnomalyDetector:
         if not end_time:
             end_time = self.now
         
-        # Get heart rate readings
-        readings = HeartRateReading.objects.filter(
+        # Get heart rate readings as plain rows; features need only a few columns
+        readings = list(HeartRateReading.objects.filter(
             user=self.user,
             timestamp__range=[start_time, end_time]
-        ).order_by('timestamp')
+        ).order_by('timestamp').values_list(
+            'id', 'timestamp', 'bpm', 'confidence', 'context',
+            ExtractHour('timestamp', tzinfo=dt_timezone.utc),
+            ExtractIsoWeekDay('timestamp', tzinfo=dt_timezone.utc)
+        ))
         
         if len(readings) < 50:  # Need enough data for anomaly detection
             logger.info(f"Insufficient data for anomaly detection: {len(readings)} readings")
@@ -47,31 +85,29 @@ class AnomalyDetector:
         if len(features) < 50:
             return []
         
-        # Normalize features
-        scaler = StandardScaler()
-        features_scaled = scaler.fit_transform(features)
-        
-        # Train Isolation Forest
-        iso_forest = IsolationForest(
-            contamination=contamination,
-            random_state=42,
-            n_estimators=100
+        # Normalize features and train (or reuse) the Isolation Forest
+        features_scaled, iso_forest = self._fit_isolation_forest(
+            f'hr:{(end_time - start_time).days}d', features,
+            contamination=contamination, n_estimators=100
         )
         
-        # Fit and predict
-        anomaly_predictions = iso_forest.fit_predict(features_scaled)
+        # Score and predict
+        anomaly_scores = iso_forest.score_samples(features_scaled)
+        # Same rule as predict(), without walking the trees a second time
+        anomaly_predictions = np.where(anomaly_scores < iso_forest.offset_, -1, 1)
         
         # Extract anomalies
         anomalies = []
         for i, (reading, prediction) in enumerate(zip(readings, anomaly_predictions)):
             if prediction == -1:  # -1 indicates anomaly
-                anomaly_score = iso_forest.score_samples([features_scaled[i]])[0]
+                anomaly_score = anomaly_scores[i]
+                reading_id, timestamp, bpm, _, context = reading[:5]
                 
                 anomalies.append({
-                    'reading_id': str(reading.id),
-                    'timestamp': reading.timestamp,
-                    'bpm': reading.bpm,
-                    'context': reading.context,
+                    'reading_id': str(reading_id),
+                    'timestamp': timestamp,
+                    'bpm': bpm,
+                    'context': context,
                     'anomaly_score': float(anomaly_score),
                     'features': features[i].tolist() if hasattr(features[i], 'tolist') else features[i],
                     'detection_method': 'isolation_forest'
@@ -86,62 +122,76 @@ class AnomalyDetector:
         return grouped_anomalies
     
     def _extract_heart_rate_features(self, readings) -> np.ndarray:
-        """Extract features from heart rate readings for anomaly detection"""
-        
-        features = []
-        
-        for i, reading in enumerate(readings):
-            # Basic features
-            feature_vector = [
-                reading.bpm,
-                reading.confidence or 1.0,
-                self._context_to_numeric(reading.context),
-                reading.timestamp.hour,  # Time of day
-                reading.timestamp.weekday()  # Day of week
-            ]
-            
-            # Add rolling statistics for context
-            if i >= 10:  # Need at least 10 previous readings
-                prev_readings = readings[max(0, i-10):i]
-                prev_bpm = [r.bpm for r in prev_readings]
-                
-                feature_vector.extend([
-                    np.mean(prev_bpm),
-                    np.std(prev_bpm),
-                    np.max(prev_bpm),
-                    np.min(prev_bpm),
-                    (reading.bpm - np.mean(prev_bpm)) / (np.std(prev_bpm) + 1e-6)  # Z-score
-                ])
-            else:
-                feature_vector.extend([reading.bpm, 0, reading.bpm, reading.bpm, 0])
-            
-            features.append(feature_vector)
-        
-        return np.array(features)
+        """Extract features from (id, timestamp, bpm, confidence, context, hour, iso weekday) rows"""
+        
+        if not readings:
+            return np.empty((0, 10))
+        _, _, bpm, confidence, contexts, hours, iso_weekdays = zip(*readings)
+        
+        # Basic features
+        bpm = np.asarray(bpm, dtype=float)
+        confidence = np.asarray(confidence, dtype=float)
+        confidence[np.isnan(confidence) | (confidence == 0)] = 1.0
+        context_codes = np.fromiter(
+            (_CONTEXT_CODES.get(c, _UNKNOWN_CONTEXT_CODE) for c in contexts),
+            dtype=np.int8, count=len(contexts)
+        )
+        hours = np.asarray(hours, dtype=float)  # Time of day
+        weekdays = np.asarray(iso_weekdays, dtype=float) - 1  # Day of week, Monday = 0
+        
+        # Rolling statistics over the 10 previous readings; the first 10 readings
+        # fall back to their own bpm with zero spread
+        window = 10
+        rolling_mean, rolling_max, rolling_min = bpm.copy(), bpm.copy(), bpm.copy()
+        rolling_std = np.zeros_like(bpm)
+        z_score = np.zeros_like(bpm)
+        if len(bpm) > window:
+            prev = sliding_window_view(bpm[:-1], window)
+            rolling_mean[window:] = prev.mean(axis=1)
+            rolling_std[window:] = prev.std(axis=1)
+            rolling_max[window:] = prev.max(axis=1)
+            rolling_min[window:] = prev.min(axis=1)
+            z_score[window:] = (bpm[window:] - rolling_mean[window:]) / (rolling_std[window:] + 1e-6)
+        
+        return np.column_stack([
+            bpm, confidence, context_codes, hours, weekdays,
+            rolling_mean, rolling_std, rolling_max, rolling_min, z_score
+        ])
     
-    def _context_to_numeric(self, context: str) -> int:
-        """Convert context to numeric value"""
-        context_map = {
-            'rest': 0,
-            'active': 1,
-            'workout': 2,
-            'recovery': 3,
-            'sleep': 4,
-            'unknown': 5
-        }
-        return context_map.get(context, 5)
+    def _fit_isolation_forest(
+        self,
+        kind: str,
+        features: np.ndarray,
+        contamination: float = 0.1,
+        **params
+    ) -> Tuple[np.ndarray, IsolationForest]:
+        """Scale features and fit an Isolation Forest, reusing the user's cached model for
+        the same detector and window until it expires or the data has grown by more than a fifth"""
+        
+        cache_key = f'anomaly:{self.user.id}:{kind}:{contamination}:v1'
+        cached = cache.get(cache_key)
+        if cached is not None:
+            fitted_rows, scaler, iso_forest = cached
+            if len(features) <= fitted_rows * _MODEL_REFIT_GROWTH:
+                return scaler.transform(features), iso_forest
+        
+        scaler = StandardScaler()
+        features_scaled = scaler.fit_transform(features)
+        iso_forest = IsolationForest(contamination=contamination, random_state=42, **params)
+        iso_forest.fit(features_scaled)
+        cache.set(cache_key, (len(features), scaler, iso_forest), timeout=_MODEL_CACHE_TIMEOUT)
+        return features_scaled, iso_forest
     
     def _update_heart_rate_anomalies(self, anomalies: List[Dict[str, Any]]):
         """Update heart rate readings with anomaly flags"""
         
-        for anomaly in anomalies:
-            try:
-                reading = HeartRateReading.objects.get(id=anomaly['reading_id'])
-                reading.is_anomaly = True
-                reading.anomaly_type = 'ml_detected'
-                reading.save()
-            except HeartRateReading.DoesNotExist:
-                continue
+        if not anomalies:
+            return
+        
+        # One UPDATE for the whole batch; readings deleted in the meantime are simply not matched
+        HeartRateReading.objects.filter(
+            id__in=[anomaly['reading_id'] for anomaly in anomalies]
+        ).update(is_anomaly=True, anomaly_type='ml_detected', updated_at=Now())
     
     def _group_anomalies(self, anomalies: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Group similar anomalies together"""
@@ -152,29 +202,21 @@ class AnomalyDetector:
         # Sort by timestamp
         anomalies.sort(key=lambda x: x['timestamp'])
         
-        grouped = []
-        current_group = []
-        group_threshold = timedelta(minutes=30)  # Group anomalies within 30 minutes
-        
-        for anomaly in anomalies:
-            if not current_group:
-                current_group.append(anomaly)
-            else:
-                last_anomaly = current_group[-1]
-                time_diff = anomaly['timestamp'] - last_anomaly['timestamp']
-                
-                if time_diff <= group_threshold:
-                    current_group.append(anomaly)
-                else:
-                    # Finalize current group
-                    grouped.append(self._create_anomaly_group(current_group))
-                    current_group = [anomaly]
-        
-        # Add last group
-        if current_group:
-            grouped.append(self._create_anomaly_group(current_group))
+        # Group anomalies within 30 minutes: split wherever the gap to the previous one is larger.
+        # Offsets are whole microseconds so the comparison stays exact.
+        group_threshold = timedelta(minutes=30)
+        microsecond = timedelta(microseconds=1)
+        first = anomalies[0]['timestamp']
+        offsets = np.fromiter(
+            ((a['timestamp'] - first) // microsecond for a in anomalies),
+            dtype=np.int64, count=len(anomalies)
+        )
+        breaks = (np.flatnonzero(np.diff(offsets) > group_threshold // microsecond) + 1).tolist()
         
-        return grouped
+        return [
+            self._create_anomaly_group(anomalies[start:end])
+            for start, end in zip([0, *breaks], [*breaks, len(anomalies)])
+        ]
     
     def _create_anomaly_group(self, anomalies: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Create a group from individual anomalies"""
@@ -218,10 +260,13 @@ class AnomalyDetector:
         end_date = self.now.date()
         start_date = end_date - timedelta(days=days)
         
-        sleep_sessions = SleepSession.objects.filter(
+        sleep_sessions = list(SleepSession.objects.filter(
             user=self.user,
             start_time__date__range=[start_date, end_date]
-        ).order_by('start_time')
+        ).order_by('start_time').values(
+            'id', 'start_time', 'duration_minutes', 'sleep_efficiency', 'quality_score',
+            'deep_minutes', 'rem_minutes', 'awake_minutes', 'interruptions'
+        ))
         
         if len(sleep_sessions) < 10:
             return []
@@ -232,14 +277,14 @@ class AnomalyDetector:
         
         for session in sleep_sessions:
             feature_vector = [
-                session.duration_minutes,
-                session.sleep_efficiency or 0,
-                session.quality_score or 0,
-                session.deep_minutes,
-                session.rem_minutes,
-                session.awake_minutes,
-                session.interruptions,
-                session.start_time.weekday()
+                session['duration_minutes'],
+                session['sleep_efficiency'] or 0,
+                session['quality_score'] or 0,
+                session['deep_minutes'],
+                session['rem_minutes'],
+                session['awake_minutes'],
+                session['interruptions'],
+                session['start_time'].weekday()
             ]
             
             features.append(feature_vector)
@@ -247,28 +292,25 @@ class AnomalyDetector:
         
         features_array = np.array(features)
         
-        # Normalize features
-        scaler = StandardScaler()
-        features_scaled = scaler.fit_transform(features_array)
-        
-        # Detect anomalies
-        iso_forest = IsolationForest(contamination=0.1, random_state=42)
-        anomaly_predictions = iso_forest.fit_predict(features_scaled)
+        # Normalize features and detect anomalies
+        features_scaled, iso_forest = self._fit_isolation_forest(f'sleep:{days}d', features_array)
+        anomaly_scores = iso_forest.score_samples(features_scaled)
+        anomaly_predictions = np.where(anomaly_scores < iso_forest.offset_, -1, 1)
         
         # Extract anomalies
         anomalies = []
         for i, (session, prediction) in enumerate(zip(sessions_list, anomaly_predictions)):
             if prediction == -1:
-                anomaly_score = iso_forest.score_samples([features_scaled[i]])[0]
+                anomaly_score = anomaly_scores[i]
                 
                 # Determine anomaly type
-                if session.duration_minutes < 300:  # Less than 5 hours
+                if session['duration_minutes'] < 300:  # Less than 5 hours
                     anomaly_type = 'extremely_short_sleep'
                     severity = 'high'
-                elif session.duration_minutes > 600:  # More than 10 hours
+                elif session['duration_minutes'] > 600:  # More than 10 hours
                     anomaly_type = 'extremely_long_sleep'
                     severity = 'medium'
-                elif session.sleep_efficiency and session.sleep_efficiency < 70:
+                elif session['sleep_efficiency'] and session['sleep_efficiency'] < 70:
                     anomaly_type = 'very_low_sleep_efficiency'
                     severity = 'medium'
                 else:
@@ -276,13 +318,13 @@ class AnomalyDetector:
                     severity = 'low'
                 
                 anomalies.append({
-                    'session_id': str(session.id),
-                    'date': session.start_time.date(),
+                    'session_id': str(session['id']),
+                    'date': session['start_time'].date(),
                     'anomaly_type': anomaly_type,
                     'severity': severity,
-                    'duration_minutes': session.duration_minutes,
-                    'sleep_efficiency': session.sleep_efficiency,
-                    'quality_score': session.quality_score,
+                    'duration_minutes': session['duration_minutes'],
+                    'sleep_efficiency': session['sleep_efficiency'],
+                    'quality_score': session['quality_score'],
                     'anomaly_score': float(anomaly_score)
                 })
         
@@ -294,83 +336,64 @@ class AnomalyDetector:
         end_date = self.now.date()
         start_date = end_date - timedelta(days=days)
         
-        activities = Activity.objects.filter(
+        activities = list(Activity.objects.filter(
             user=self.user,
             start_time__date__range=[start_date, end_date]
-        ).order_by('start_time')
+        ).order_by('start_time').values(
+            'id', 'activity_type', 'start_time', 'duration_minutes', 'calories_burned',
+            'distance_km', 'steps', 'avg_heart_rate'
+        ))
         
         if len(activities) < 10:
             return []
         
-        # Group activities by type
-        activities_by_type = {}
-        for activity in activities:
-            if activity.activity_type not in activities_by_type:
-                activities_by_type[activity.activity_type] = []
-            activities_by_type[activity.activity_type].append(activity)
+        df = pd.DataFrame.from_records(activities)
+        df['weekday'] = df['start_time'].dt.weekday
         
         anomalies = []
         
         # Detect anomalies for each activity type
-        for activity_type, type_activities in activities_by_type.items():
-            if len(type_activities) < 5:
+        for activity_type, group in df.groupby('activity_type', sort=False):
+            if len(group) < 5:
                 continue
             
-            # Extract features for this activity type
-            features = []
-            activities_list = []
-            
-            for activity in type_activities:
-                feature_vector = [
-                    activity.duration_minutes,
-                    activity.calories_burned,
-                    activity.distance_km or 0,
-                    activity.steps or 0,
-                    activity.avg_heart_rate or 0,
-                    activity.start_time.weekday()
-                ]
-                
-                features.append(feature_vector)
-                activities_list.append(activity)
-            
-            features_array = np.array(features)
+            # Missing optional metrics count as zero
+            features_array = group[_ACTIVITY_FEATURES].fillna(0).to_numpy(dtype=float)
             
             # Remove features with no variance
             if features_array.shape[1] > 0 and np.std(features_array, axis=0).sum() > 0:
-                # Normalize features
-                scaler = StandardScaler()
-                features_scaled = scaler.fit_transform(features_array)
-                
-                # Detect anomalies
-                iso_forest = IsolationForest(contamination=0.1, random_state=42)
-                anomaly_predictions = iso_forest.fit_predict(features_scaled)
+                # Normalize features and detect anomalies
+                features_scaled, iso_forest = self._fit_isolation_forest(
+                    f'activity:{days}d:{activity_type}', features_array
+                )
+                anomaly_scores = iso_forest.score_samples(features_scaled)
                 
                 # Extract anomalies
-                for i, (activity, prediction) in enumerate(zip(activities_list, anomaly_predictions)):
-                    if prediction == -1:
-                        anomaly_score = iso_forest.score_samples([features_scaled[i]])[0]
-                        
-                        # Determine anomaly type
-                        if activity.duration_minutes > 180:  # More than 3 hours
-                            anomaly_type = 'extremely_long_activity'
-                            severity = 'medium'
-                        elif activity.calories_burned > 1000:
-                            anomaly_type = 'extremely_high_calorie_burn'
-                            severity = 'medium'
-                        else:
-                            anomaly_type = 'irregular_activity_pattern'
-                            severity = 'low'
-                        
-                        anomalies.append({
-                            'activity_id': str(activity.id),
-                            'date': activity.start_time.date(),
-                            'activity_type': activity.activity_type,
-                            'anomaly_type': anomaly_type,
-                            'severity': severity,
-                            'duration_minutes': activity.duration_minutes,
-                            'calories_burned': activity.calories_burned,
-                            'anomaly_score': float(anomaly_score)
-                        })
+                for i in np.flatnonzero(anomaly_scores < iso_forest.offset_):
+                    activity = activities[group.index[i]]
+                    anomaly_score = anomaly_scores[i]
+                    
+                    # Determine anomaly type
+                    if activity['duration_minutes'] > 180:  # More than 3 hours
+                        anomaly_type = 'extremely_long_activity'
+                        severity = 'medium'
+                    elif activity['calories_burned'] > 1000:
+                        anomaly_type = 'extremely_high_calorie_burn'
+                        severity = 'medium'
+                    else:
+                        anomaly_type = 'irregular_activity_pattern'
+                        severity = 'low'
+                    
+                    anomalies.append({
+                        'activity_id': str(activity['id']),
+                        'date': activity['start_time'].date(),
+                        'activity_type': activity['activity_type'],
+                        'anomaly_type': anomaly_type,
+                        'severity': severity,
+                        'duration_minutes': activity['duration_minutes'],
+                        'calories_burned': activity['calories_burned'],
+                        'anomaly_score': float(anomaly_score)
+                    })
         
         return anomalies
     
@@ -388,13 +411,24 @@ class AnomalyDetector:
         }
         
         # Detect all types of anomalies
-        heart_rate_anomalies = self.detect_heart_rate_anomalies(
-            start_time=self.now - timedelta(days=days)
+        detectors = (
+            (self.detect_heart_rate_anomalies, {'start_time': self.now - timedelta(days=days)}),
+            (self.detect_sleep_anomalies, {'days': days}),
+            (self.detect_activity_anomalies, {'days': days}),
         )
-        
-        sleep_anomalies = self.detect_sleep_anomalies(days=days)
-        
-        activity_anomalies = self.detect_activity_anomalies(days=days)
+        if connection.in_atomic_block:
+            # Pool threads get their own connections, which can't see this
+            # transaction's uncommitted rows (and would wait on its write lock)
+            results = [detect(**kwargs) for detect, kwargs in detectors]
+        else:
+            # The detectors are independent, so run them side by side
+            with ThreadPoolExecutor(max_workers=len(detectors)) as executor:
+                futures = [
+                    executor.submit(_run_detector, detect, **kwargs)
+                    for detect, kwargs in detectors
+                ]
+            results = [future.result() for future in futures]
+        heart_rate_anomalies, sleep_anomalies, activity_anomalies = results
         
         report['heart_rate_anomalies'] = heart_rate_anomalies
         report['sleep_anomalies'] = sleep_anomalies
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.8 on 2026-10-15 23:16
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('health_data', '0002_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='healthalert',
+            index=models.Index(fields=['user', 'triggered_at'], name='health_aler_user_id_9acece_idx'),
+        ),
+    ]
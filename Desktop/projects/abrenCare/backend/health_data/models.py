@@ -704,6 +704,7 @@ class HealthAlert(models.Model):
             models.Index(fields=['user', 'is_read']),
             models.Index(fields=['user', 'alert_type']),
             models.Index(fields=['user', 'severity']),
+            models.Index(fields=['user', 'triggered_at']),
             models.Index(fields=['triggered_at']),
         ]
         ordering = ['-triggered_at']
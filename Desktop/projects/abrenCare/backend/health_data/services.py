@@ -215,15 +215,19 @@ class HealthDataService:
         
         processed_count = 0
         
+        # Analyze all activities in one batch
+        recovery_hours = {
+            result.activity_id: result.estimated_recovery_hours
+            for result in ActivityProcessor.analyze_activities(unprocessed_activities)
+        }
+        
         for activity in unprocessed_activities:
+            if activity.id not in recovery_hours:
+                continue  # Arrived after the batch; picked up on the next run
+            
             try:
-                # Analyze activity
-                analysis = ActivityProcessor.analyze_activity(activity)
-                
                 # Update activity with recovery time estimate
-                recovery_analysis = analysis.get('recovery_analysis', {})
-                if recovery_analysis:
-                    activity.recovery_time_minutes = recovery_analysis.get('estimated_recovery_hours', 0) * 60
+                activity.recovery_time_minutes = recovery_hours[activity.id] * 60
                 
                 activity.processed_at = timezone.now()
                 activity.save()
@@ -1,3 +1,95 @@
-from django.test import TestCase
+import random
+from datetime import timedelta
 
-# Create your tests here.
+from django.core.cache import cache
+from django.test import TestCase, TransactionTestCase
+
+from users.models import User
+from .anomaly_detector import AnomalyDetector
+from .models import HeartRateReading, SleepSession, Activity
+
+
+class AnomalyReportMixin:
+    """Seed a week of readings, sleep and activities with some outliers"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('alice', 'alice@example.com', 'pass')
+        self.detector = AnomalyDetector(self.user)
+        now = self.detector.now
+        rng = random.Random(0)
+
+        HeartRateReading.objects.bulk_create([
+            HeartRateReading(
+                user=self.user,
+                timestamp=now - timedelta(minutes=15 * i + 1),
+                bpm=rng.choice([rng.randint(55, 95)] * 9 + [rng.randint(150, 190)]),
+                confidence=0.9,
+                context=rng.choice(['rest', 'active', 'sleep']),
+            )
+            for i in range(300)
+        ])
+
+        sessions = []
+        for i in range(14):
+            start = now - timedelta(hours=12 * i + 6)
+            duration = rng.choice([420, 450, 480, 240])
+            sessions.append(SleepSession(
+                user=self.user,
+                start_time=start,
+                end_time=start + timedelta(minutes=duration),
+                duration_minutes=duration,
+                sleep_efficiency=rng.choice([85, 90, 60]),
+                quality_score=rng.choice([70, 80, 40]),
+                deep_minutes=rng.randint(40, 100),
+                rem_minutes=rng.randint(60, 110),
+                awake_minutes=rng.randint(5, 60),
+                interruptions=rng.randint(0, 5),
+            ))
+        SleepSession.objects.bulk_create(sessions)
+
+        activities = []
+        for i in range(16):
+            start = now - timedelta(hours=9 * i + 2)
+            duration = rng.choice([30, 45, 60, 200])
+            activities.append(Activity(
+                user=self.user,
+                activity_type=('running', 'walking')[i % 2],
+                intensity='moderate',
+                start_time=start,
+                end_time=start + timedelta(minutes=duration),
+                duration_minutes=duration,
+                calories_burned=rng.uniform(150, 1200),
+                distance_km=rng.choice([None, 3.0, 8.5]),
+                steps=rng.choice([None, 5000]),
+                avg_heart_rate=rng.choice([None, 120, 150]),
+            ))
+        Activity.objects.bulk_create(activities)
+
+    def assertReportMatchesDetectors(self):
+        report = self.detector.generate_anomaly_report(days=7)
+
+        self.assertEqual(
+            report['heart_rate_anomalies'],
+            self.detector.detect_heart_rate_anomalies(start_time=self.detector.now - timedelta(days=7))
+        )
+        self.assertEqual(report['sleep_anomalies'], self.detector.detect_sleep_anomalies(days=7))
+        self.assertEqual(report['activity_anomalies'], self.detector.detect_activity_anomalies(days=7))
+        self.assertTrue(report['heart_rate_anomalies'])
+        self.assertTrue(report['sleep_anomalies'])
+        self.assertTrue(report['activity_anomalies'])
+        self.assertTrue(HeartRateReading.objects.filter(user=self.user, is_anomaly=True).exists())
+
+
+class AnomalyReportTests(AnomalyReportMixin, TransactionTestCase):
+    """Outside a transaction the detectors run on worker threads"""
+
+    def test_report_matches_sequential_detectors(self):
+        self.assertReportMatchesDetectors()
+
+
+class AnomalyReportInTransactionTests(AnomalyReportMixin, TestCase):
+    """Inside a transaction (ATOMIC_REQUESTS, TestCase) uncommitted rows must still be seen"""
+
+    def test_report_matches_sequential_detectors(self):
+        self.assertReportMatchesDetectors()